@@ -1,12 +1,19 @@
 """
 Authentication utilities: JWT token creation/verification, password hashing, OTP management
 """
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Union
-from jose import JWTError, jwt
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional, Dict, Union, Tuple
+import jwt
 from passlib.context import CryptContext
+import bcrypt
+import os
 import re
+import time
 import hmac
+import string
+import anyio
+import anyio.to_thread
 from .config import settings
 from .utils.otp_manager import generate_otp_code, generate_otp_token, validate_otp_token
 
@@ -16,53 +23,132 @@ ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Signing keys are encoded once instead of on every encode/decode
+_SIGNING_KEY = SECRET_KEY.encode("utf-8")
+_RESET_KEY = settings.SECRET_RESET_KEY.encode("utf-8")
+
+# Token lifetimes in seconds; JWT stores exp/iat as integer NumericDate
+_ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TOKEN_EXPIRE_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 86400
+_RESET_TOKEN_EXPIRE_SECONDS = settings.RESET_TOKEN_EXPIRE_MINUTES * 60
+
+# New hashes use Argon2id. bcrypt hashes from before the switch, and Argon2
+# hashes made with different cost settings, still verify and are rehashed
+# with the current settings on the next successful login. Those legacy hashes
+# ($2a$/$2b$/$2y$) are checked by the bcrypt C extension directly.
+_BCRYPT_PREFIX = "$2"
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM
+)
+
+# argon2-cffi and bcrypt release the GIL, so hashing threads run in parallel up to the core count.
+# Created lazily because a CapacityLimiter must be built inside the event loop.
+_hash_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def _get_hash_limiter() -> anyio.CapacityLimiter:
+    global _hash_limiter
+    if _hash_limiter is None:
+        _hash_limiter = anyio.CapacityLimiter(os.cpu_count() or 1)
+    return _hash_limiter
+
+
+# Password character classes, checked in a single pass over the password
+_UPPER_CHARS = frozenset(string.ascii_uppercase)
+_LOWER_CHARS = frozenset(string.ascii_lowercase)
+_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+_USERNAME_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+
+# Email pattern, compiled once at import and matched against the whole string
+_RE_EMAIL = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
+    if hashed_password.startswith(_BCRYPT_PREFIX):
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a replacement hash if the stored one is outdated
+    
+    Returns:
+        Tuple: (valid, new_hash) - new_hash is None unless the hash needs upgrading
+    """
+    if not hashed_password.startswith(_BCRYPT_PREFIX):
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    
+    # Legacy bcrypt hash: verify, then migrate it to Argon2id
+    if not bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8")):
+        return False, None
+    return True, get_password_hash(plain_password)
+
+
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
+    """Hash a password with Argon2id"""
     return pwd_context.hash(password)
 
 
+async def aget_password_hash(password: str) -> str:
+    """Hash a password in a worker thread so hashing does not block the event loop"""
+    return await anyio.to_thread.run_sync(get_password_hash, password, limiter=_get_hash_limiter())
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
-    to_encode = data.copy()
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + _ACCESS_TOKEN_EXPIRE_SECONDS
     
-    to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode = {**data, "exp": expire, "type": "access"}
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token"""
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    expire = int(time.time()) + _REFRESH_TOKEN_EXPIRE_SECONDS
+    to_encode = {**data, "exp": expire, "type": "refresh"}
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> dict:
+    """
+    Decode and signature-check a token, memoized per token string.
+    Invalid tokens raise and are therefore never cached.
+    """
+    return jwt.decode(token, _SIGNING_KEY, algorithms=[ALGORITHM])
+
+
 def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     """
     Verify and decode a JWT token
     Returns payload if valid, None otherwise
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload.get("type") != token_type:
-            return None
-        return payload
-    except JWTError:
+        payload = _decode_token(token)
+    except jwt.InvalidTokenError:
+        return None
+    
+    # The cached payload may outlive the token, so expiry is re-checked on every call
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
         return None
+    if not hmac.compare_digest(str(payload.get("type", "")), token_type):
+        return None
+    return dict(payload)
 
 
 # OTP and Reset Token Functions
@@ -125,17 +211,17 @@ def create_reset_token(username: str, purpose: str = "password_reset") -> str:
     Returns:
         str: JWT reset token
     """
-    expire_time = datetime.utcnow() + timedelta(minutes=settings.RESET_TOKEN_EXPIRE_MINUTES)
+    now = int(time.time())
     
     payload = {
         "sub": username,
         "purpose": purpose,
-        "iat": datetime.utcnow(),
-        "exp": expire_time,
+        "iat": now,
+        "exp": now + _RESET_TOKEN_EXPIRE_SECONDS,
         "type": "reset"
     }
     
-    token = jwt.encode(payload, settings.SECRET_RESET_KEY, algorithm=ALGORITHM)
+    token = jwt.encode(payload, _RESET_KEY, algorithm=ALGORITHM)
     return token
 
 
@@ -150,11 +236,11 @@ def verify_reset_token(token: str) -> Optional[dict]:
         dict: Token payload if valid, None otherwise
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_RESET_KEY, algorithms=[ALGORITHM])
-        if payload.get("type") != "reset":
+        payload = jwt.decode(token, _RESET_KEY, algorithms=[ALGORITHM])
+        if not hmac.compare_digest(str(payload.get("type", "")), "reset"):
             return None
         return payload
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
 
 
@@ -180,20 +266,32 @@ def validate_password_strength(password: str) -> Dict[str, Union[bool, str]]:
     if len(password) < 8:
         errors.append("Mật khẩu phải có ít nhất 8 ký tự")
     
+    # Classify every character in one pass
+    has_upper = has_lower = has_digit = has_special = False
+    for ch in password:
+        if ch in _UPPER_CHARS:
+            has_upper = True
+        elif ch in _LOWER_CHARS:
+            has_lower = True
+        elif ch.isdecimal():
+            has_digit = True
+        elif ch in _SPECIAL_CHARS:
+            has_special = True
+    
     # Uppercase letter
-    if not re.search(r'[A-Z]', password):
+    if not has_upper:
         errors.append("Mật khẩu phải có ít nhất 1 chữ cái viết hoa")
     
     # Lowercase letter
-    if not re.search(r'[a-z]', password):
+    if not has_lower:
         errors.append("Mật khẩu phải có ít nhất 1 chữ cái viết thường")
     
     # Number
-    if not re.search(r'\d', password):
+    if not has_digit:
         errors.append("Mật khẩu phải có ít nhất 1 chữ số")
     
     # Special character
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if not has_special:
         errors.append("Mật khẩu phải có ít nhất 1 ký tự đặc biệt")
     
     if errors:
@@ -220,9 +318,7 @@ def validate_email_format(email: str) -> bool:
     Returns:
         bool: True if valid format, False otherwise
     """
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    return bool(re.match(email_pattern, email))
+    return _RE_EMAIL.fullmatch(email) is not None
 
 
 def validate_username_format(username: str) -> dict:
@@ -244,7 +340,7 @@ def validate_username_format(username: str) -> dict:
         errors.append("Username không được vượt quá 32 ký tự")
     
     # Check valid characters (alphanumeric + underscore)
-    if not re.match(r'^[a-zA-Z0-9_]+$', username):
+    if not username or not _USERNAME_CHARS.issuperset(username):
         errors.append("Username chỉ được chứa chữ cái, số và dấu gạch dưới")
     
     if errors:
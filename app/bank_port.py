@@ -2,7 +2,7 @@
 BankPort - Mock bank API interface for handling deposits and payments
 Gateway class để giao tiếp với dịch vụ API ngân hàng ngoài
 """
-import uuid
+from secrets import token_hex
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
@@ -22,6 +22,7 @@ class BankPort:
         self.bank_name = "MockBank VietNam"
         self.bank_code = "MB"
         self.is_mock_mode = True  # Đánh dấu đây là mock mode
+        self._qr_prefix = f"{self.bank_code}://QR?"
         
     def get_service_status(self) -> Dict[str, Any]:
         """
@@ -42,26 +43,16 @@ class BankPort:
         """
         Generate mock QR code for transaction
         """
-        # Mock QR code data - in real implementation, this would be a proper QR code
-        qr_data = {
-            "bank_code": self.bank_code,
-            "bank_name": self.bank_name,
-            "transaction_id": transaction_id,
-            "amount": amount,
-            "description": description or "Auction payment",
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
         # Mock QR code string (in real app, this would be actual QR code image data)
-        qr_string = f"MB://QR?data={transaction_id}&amount={amount}&desc={description or 'Auction payment'}"
-        return qr_string
+        return f"{self._qr_prefix}data={transaction_id}&amount={amount}&desc={description or 'Auction payment'}"
     
     def create_deposit_transaction(self, db: Session, user_id: int, auction_id: int, amount: int) -> Dict[str, Any]:
         """
         Create deposit transaction (đặt cọc)
         For demo: always returns success immediately
         """
-        transaction_id = f"DEP_{uuid.uuid4().hex[:12].upper()}"
+        now_iso = datetime.utcnow().isoformat()
+        transaction_id = f"DEP_{token_hex(6).upper()}"
         
         # Generate QR code
         qr_code = self.generate_qr_code(
@@ -78,10 +69,10 @@ class BankPort:
             "bank_response": {
                 "code": "00",
                 "message": "Deposit successful",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             },
             "qr_code": qr_code,
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": now_iso
         }
         
         return deposit_result
@@ -91,7 +82,8 @@ class BankPort:
         Create payment transaction (thanh toán)
         For demo: returns pending status with QR code
         """
-        transaction_id = f"PAY_{uuid.uuid4().hex[:12].upper()}"
+        now_iso = datetime.utcnow().isoformat()
+        transaction_id = f"PAY_{token_hex(6).upper()}"
         
         # Generate QR code
         qr_code = self.generate_qr_code(
@@ -108,11 +100,11 @@ class BankPort:
             "bank_response": {
                 "code": "01",
                 "message": "Payment pending - scan QR to confirm",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             },
             "qr_code": qr_code,
             "payment_id": payment_id,
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": now_iso
         }
         
         return payment_result
@@ -122,6 +114,7 @@ class BankPort:
         Process payment confirmation (when user scans QR or clicks payment link)
         For demo: returns success
         """
+        now_iso = datetime.utcnow().isoformat()
         # Mock payment processing - always successful for demo
         confirmation_result = {
             "transaction_id": transaction_id,
@@ -130,9 +123,9 @@ class BankPort:
             "bank_response": {
                 "code": "00",
                 "message": "Payment completed successfully",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             },
-            "confirmed_at": datetime.utcnow().isoformat()
+            "confirmed_at": now_iso
         }
         
         return confirmation_result
@@ -209,7 +202,7 @@ class BankPort:
         Endpoint gateway: Chuyển tiền
         Default trả về thành công (mock mode)
         """
-        transaction_id = f"TXN_{uuid.uuid4().hex[:12].upper()}"
+        transaction_id = f"TXN_{token_hex(6).upper()}"
         
         return {
             "success": True,
@@ -222,7 +215,7 @@ class BankPort:
             "bank_code": bank_code or self.bank_code,
             "status": "completed",
             "transaction_time": datetime.utcnow().isoformat(),
-            "reference_number": f"REF{uuid.uuid4().hex[:8].upper()}",
+            "reference_number": f"REF{token_hex(4).upper()}",
             "mock_response": True
         }
     
@@ -235,7 +228,7 @@ class BankPort:
         transactions = []
         for i in range(min(limit, 5)):  # Mock 5 transactions max
             transactions.append({
-                "transaction_id": f"TXN_{uuid.uuid4().hex[:12].upper()}",
+                "transaction_id": f"TXN_{token_hex(6).upper()}",
                 "amount": 50000 + (i * 10000),
                 "type": "credit" if i % 2 == 0 else "debit",
                 "description": f"Giao dịch mock #{i+1}",
@@ -1,11 +1,25 @@
 """
 Application configuration loaded from environment variables
 """
+from functools import lru_cache, cached_property
+from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Tuple
 
 
-class Settings(BaseSettings):
+class EnvSettings(BaseSettings):
+    """Shared .env loading policy for every settings class in the project"""
+    
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True
+    )
+
+
+class Settings(EnvSettings):
     # Database
     DATABASE_URL: str
     MYSQL_HOST: str
@@ -14,12 +28,28 @@ class Settings(BaseSettings):
     MYSQL_PASSWORD: str
     MYSQL_DATABASE: str
     
+    # Connection pool and compiled statement cache
+    DB_POOL_SIZE: int = 25
+    DB_MAX_OVERFLOW: int = 25
+    DB_POOL_RECYCLE: int = 1800  # seconds, below MySQL's wait_timeout
+    DB_POOL_TIMEOUT: int = 10  # seconds to wait for a free connection before failing
+    DB_QUERY_CACHE_SIZE: int = 1200
+    # The async engine only serves notification reads and WebSocket fan-out,
+    # so it gets its own, smaller pool on top of the sync one
+    DB_ASYNC_POOL_SIZE: int = 5
+    DB_ASYNC_MAX_OVERFLOW: int = 5
+    
     # JWT Authentication
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
     
+    # Password hashing cost; defaults are the OWASP Argon2id minimum
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 19456  # KiB
+    ARGON2_PARALLELISM: int = 1
+    
     # OTP and Password Reset Token Keys (separate from main SECRET_KEY)
     SECRET_OTP_KEY: str
     SECRET_RESET_KEY: str
@@ -47,14 +77,23 @@ class Settings(BaseSettings):
     # CORS (optional, for frontend integration)
     ALLOWED_ORIGINS: str
     
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        extra="ignore"
-    )
+    @computed_field
+    @cached_property
+    def allowed_origins_list(self) -> Tuple[str, ...]:
+        """ALLOWED_ORIGINS parsed once from its comma-separated form"""
+        return tuple(origin.strip() for origin in self.ALLOWED_ORIGINS.split(",") if origin.strip())
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build Settings on first use and reuse the same instance afterwards"""
+    return Settings()
 
 
-# Global settings instance
-settings = Settings()
+def __getattr__(name: str):
+    # Keep `from app.config import settings` working without parsing the
+    # environment at import time of this module
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
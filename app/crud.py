@@ -1,42 +1,160 @@
-from sqlalchemy.orm import Session
+import orjson
+import re
+import threading
+from collections import namedtuple
+from cachetools import TTLCache
+from sqlalchemy import Row, Integer, DateTime, inspect, select, update, delete, func, bindparam, lambda_stmt, or_, tuple_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload, raiseload
 from datetime import datetime
-from typing import List
+from typing import List, NamedTuple, Optional
 
 from . import models, schemas
-from .auth import get_password_hash, verify_password
+from .database import AsyncSessionLocal, engine
+from .auth import get_password_hash, verify_and_update_password
 
 
 # ========== ENUMS ========== #
-from .models import UserRole, AccountStatus
+from .models import UserRole, AccountStatus, BidStatus
 
 
-# ========== ITEM CRUD ========== #
-def get_item(db: Session, item_id: int):
-    return db.query(models.Item).filter(models.Item.id == item_id).first()
+# ========== PAGINATION ========== #
+# List getters page by keyset: the cursor holds the sort key of the last row
+# already returned, so the database seeks straight to the next page instead of
+# reading and discarding `skip` rows. `skip` is deprecated and ignored once a
+# cursor is given.
+# Descending listings accept a NULL cursor for the first page; pymysql inlines
+# parameters, so MySQL folds the IS NULL branch away before planning.
+_AFTER_ID = bindparam("after_id", type_=Integer)
 
 
-def create_item(db: Session, item: schemas.ItemCreate):
-    db_item = models.Item(title=item.title, description=item.description)
-    db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
-    return db_item
+def _after_id(cursor: Optional[schemas.Cursor], skip: int) -> dict:
+    if cursor is None:
+        return {"after_id": 0, "skip": skip}
+    return {"after_id": cursor.id, "skip": 0}
+
+
+def _after_key(cursor: Optional[schemas.Cursor], skip: int) -> dict:
+    if cursor is None:
+        return {"after_key": None, "after_id": None, "skip": skip}
+    return {"after_key": cursor.key, "after_id": cursor.id, "skip": 0}
+
+
+# Leaf listings are serialized column by column; raiseload turns an accidental
+# per-row lazy load into an error instead of a silent N+1.
+_NO_LAZY = raiseload("*")
 
 
 # ========== ACCOUNT CRUD ========== #
+# Read statements are built once at import; SQLAlchemy's compiled cache then
+# serves them on every call without rebuilding the clause tree. Primary-key
+# lookups use Session.get(), which returns an instance already in the
+# session's identity map without a round trip.
+_STMT_ACCOUNT_BY_USERNAME = select(models.Account).where(models.Account.username == bindparam("username"))
+_STMT_ACCOUNT_BY_EMAIL = select(models.Account).where(models.Account.email == bindparam("email"))
+_STMT_ACCOUNT_DISPLAY = select(
+    models.Account.username,
+    models.Account.firstName,
+    models.Account.lastName
+).where(models.Account.accountID == bindparam("account_id"))
+_STMT_ACCOUNT_FOR_AUTH = select(
+    models.Account.accountID,
+    models.Account.username,
+    models.Account.password
+).where(models.Account.username == bindparam("username"))
+
+
 def get_account_by_username(db: Session, username: str) -> models.Account | None:
     """Get account by username"""
-    return db.query(models.Account).filter(models.Account.username == username).first()
+    return db.execute(_STMT_ACCOUNT_BY_USERNAME, {"username": username}).scalar_one_or_none()
+
+
+def get_account_by_email(db: Session, email: str) -> models.Account | None:
+    """Get account by email"""
+    return db.execute(_STMT_ACCOUNT_BY_EMAIL, {"email": email}).scalar_one_or_none()
 
 
 def get_account_by_id(db: Session, account_id: int) -> models.Account | None:
     """Get account by ID"""
-    return db.query(models.Account).filter(models.Account.accountID == account_id).first()
+    return db.get(models.Account, account_id)
 
 
-def create_account(db: Session, account: schemas.AccountCreate) -> models.Account:
-    """Create new account with hashed password"""
-    hashed_password = get_password_hash(account.password)
+class AccountDisplay(NamedTuple):
+    username: str
+    firstName: str
+    lastName: str
+
+
+# Display names are read on every bid/outbid event but rarely change. Only
+# plain tuples are cached, never ORM instances, so no session state leaks
+# between requests. Sync endpoints run in a threadpool, hence the lock.
+_account_display_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+_account_display_lock = threading.Lock()
+
+
+def get_account_display(db: Session, account_id: int) -> AccountDisplay | None:
+    """Get an account's username and names, cached for a short time"""
+    with _account_display_lock:
+        cached = _account_display_cache.get(account_id)
+    if cached is not None:
+        return cached
+    
+    row = db.execute(_STMT_ACCOUNT_DISPLAY, {"account_id": account_id}).first()
+    if row is None:
+        return None
+    
+    display = AccountDisplay(*row)
+    with _account_display_lock:
+        _account_display_cache[account_id] = display
+    return display
+
+
+# Every authenticated request resolves the token's username to an account.
+# Those reads are served from an immutable snapshot of the row's columns
+# (without the password hash) for a short time. Writes to an account in this
+# process invalidate it; the TTL bounds staleness from other workers.
+AccountSnapshot = namedtuple(
+    "AccountSnapshot",
+    [attr.key for attr in models.Account.__mapper__.column_attrs if attr.key != "password"]
+)
+_STMT_ACCOUNT_SNAPSHOT = select(
+    *(getattr(models.Account, field) for field in AccountSnapshot._fields)
+).where(models.Account.username == bindparam("username"))
+_account_snapshot_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_account_snapshot_lock = threading.Lock()
+
+
+def get_account_snapshot(db: Session, username: str) -> AccountSnapshot | None:
+    """Get a read-only copy of an account by username, cached for a short time"""
+    with _account_snapshot_lock:
+        cached = _account_snapshot_cache.get(username)
+    if cached is not None:
+        return cached
+    
+    row = db.execute(_STMT_ACCOUNT_SNAPSHOT, {"username": username}).first()
+    if row is None:
+        return None
+    
+    snapshot = AccountSnapshot(*row)
+    with _account_snapshot_lock:
+        _account_snapshot_cache[username] = snapshot
+    return snapshot
+
+
+def invalidate_account_cache(account_id: int, username: str):
+    """Drop cached copies of an account after it was changed or deleted"""
+    with _account_display_lock:
+        _account_display_cache.pop(account_id, None)
+    with _account_snapshot_lock:
+        _account_snapshot_cache.pop(username, None)
+
+
+# stage_* helpers add a new row to the session without committing, so an
+# endpoint making several writes can stage them and commit once (flush first
+# if a generated ID is needed). create_* stage and commit a single row.
+def stage_account(db: Session, account: schemas.AccountCreate, hashed_password: str) -> models.Account:
+    """Build a new account and add it to the session; the caller commits"""
     db_account = models.Account(
         username=account.username,
         email=account.email,
@@ -51,33 +169,65 @@ def create_account(db: Session, account: schemas.AccountCreate) -> models.Accoun
         isAuthenticated=False
     )
     db.add(db_account)
+    return db_account
+
+
+def create_account(db: Session, account: schemas.AccountCreate) -> models.Account:
+    """Create new account with hashed password"""
+    hashed_password = get_password_hash(account.password)
+    db_account = stage_account(db, account, hashed_password)
     db.commit()
-    db.refresh(db_account)
     return db_account
 
 
-def authenticate_account(db: Session, username: str, password: str) -> models.Account | None:
+def get_account_for_auth(db: Session, username: str) -> Row | None:
+    """Get only the columns needed to authenticate (accountID, username, password)"""
+    return db.execute(_STMT_ACCOUNT_FOR_AUTH, {"username": username}).first()
+
+
+# Hash checked against when the username does not exist, so unknown and known
+# usernames take the same time to reject
+_DUMMY_HASH = get_password_hash("x" * 16)
+
+
+def authenticate_account(db: Session, username: str, password: str) -> Row | None:
     """Authenticate account with username and password"""
-    account = get_account_by_username(db, username)
-    if not account:
-        return None
-    if not verify_password(password, account.password):
+    account = get_account_for_auth(db, username)
+    # Unknown usernames are checked against a dummy hash through the same call,
+    # so both outcomes cost one Argon2 verification
+    valid, new_hash = verify_and_update_password(
+        password, account.password if account else _DUMMY_HASH
+    )
+    if not account or not valid:
         return None
+    if new_hash:
+        # Rehash on login when the stored hash is bcrypt or uses outdated cost settings
+        db.execute(
+            update(models.Account)
+            .where(models.Account.accountID == account.accountID)
+            .values(password=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
     return account
 
 
 def update_account(db: Session, account_id: int, account_update: schemas.AccountUpdate) -> models.Account | None:
     """Update account information"""
-    db_account = get_account_by_id(db, account_id)
-    if not db_account:
-        return None
-    
-    update_data = account_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_account, field, value)
+    update_data = account_update.model_dump(exclude_unset=True)
+    if update_data:
+        result = db.execute(
+            update(models.Account)
+            .where(models.Account.accountID == account_id)
+            .values(**update_data)
+        )
+        db.commit()
+        if result.rowcount == 0:
+            return None
     
-    db.commit()
-    db.refresh(db_account)
+    db_account = get_account_by_id(db, account_id)
+    if update_data:
+        invalidate_account_cache(account_id, db_account.username)
     return db_account
 
 
@@ -90,27 +240,36 @@ def delete_unactivated_account(db: Session, username: str) -> bool:
     # Delete the account
     db.delete(db_account)
     db.commit()
+    invalidate_account_cache(db_account.accountID, username)
     return True
 
 
 # ========== PRODUCT CRUD ========== #
+_STMT_PRODUCTS = (
+    select(models.Product)
+    .where(models.Product.productID > _AFTER_ID)
+    .order_by(models.Product.productID)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+
 def get_product(db: Session, product_id: int) -> models.Product | None:
     """Get product by ID"""
-    return db.query(models.Product).filter(models.Product.productID == product_id).first()
+    return db.get(models.Product, product_id)
 
 
-def get_products(db: Session, skip: int = 0, limit: int = 100) -> List[models.Product]:
+def get_products(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Product]:
     """Get all products with pagination"""
-    return db.query(models.Product).offset(skip).limit(limit).all()
+    return db.execute(
+        _STMT_PRODUCTS, {**_after_id(cursor, skip), "limit": limit}
+    ).scalars().all()
 
 
-def create_product(db: Session, product: schemas.ProductCreate, user_id: int = None) -> models.Product:
-    """Create new product"""
+def stage_product(db: Session, product: schemas.ProductCreate, user_id: int = None) -> models.Product:
+    """Build a new product and add it to the session; the caller commits"""
     # Handle additionalImages list - convert to JSON string for database storage
-    additional_images_json = None
-    if product.additionalImages:
-        import json
-        additional_images_json = json.dumps(product.additionalImages)
+    additional_images_json = orjson.dumps(product.additionalImages).decode() if product.additionalImages else None
     
     db_product = models.Product(
         productName=product.productName,
@@ -121,85 +280,123 @@ def create_product(db: Session, product: schemas.ProductCreate, user_id: int = N
         shippingStatus=None,  # Set default to None
         approvalStatus="pending",
         rejectionReason=None,  # Set default to None
-        suggestedByUserID=user_id,
-        createdAt=datetime.utcnow(),
-        updatedAt=None  # Set default to None for new products
+        suggestedByUserID=user_id
     )
     db.add(db_product)
+    return db_product
+
+
+def create_product(db: Session, product: schemas.ProductCreate, user_id: int = None) -> models.Product:
+    """Create new product"""
+    db_product = stage_product(db, product, user_id)
     db.commit()
-    db.refresh(db_product)
     return db_product
 
 
 def update_product(db: Session, product_id: int, product_update: schemas.ProductUpdate) -> models.Product | None:
     """Update product information"""
-    db_product = get_product(db, product_id)
-    if not db_product:
-        return None
+    update_data = product_update.model_dump(exclude_unset=True)
+    if update_data.get("additionalImages") is not None:
+        update_data["additionalImages"] = orjson.dumps(update_data["additionalImages"]).decode()
     
-    update_data = product_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_product, field, value)
-    
-    db_product.updatedAt = datetime.utcnow()
+    result = db.execute(
+        update(models.Product)
+        .where(models.Product.productID == product_id)
+        .values(**update_data, updatedAt=func.now())
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
-    db.refresh(db_product)
-    return db_product
+    if result.rowcount == 0:
+        return None
+    # updatedAt is set by the database, so reload over any instance already in the session
+    return db.get(models.Product, product_id, populate_existing=True)
 
 
 def delete_product(db: Session, product_id: int) -> bool:
     """Delete product"""
-    db_product = get_product(db, product_id)
-    if not db_product:
-        return False
-    
-    db.delete(db_product)
+    # Products own no cascaded rows, so a single DELETE replaces load-then-delete
+    result = db.execute(delete(models.Product).where(models.Product.productID == product_id))
     db.commit()
-    return True
+    return result.rowcount > 0
 
 
 # ========== AUCTION CRUD ========== #
+_STMT_AUCTIONS = (
+    select(models.Auction)
+    .where(models.Auction.auctionID > _AFTER_ID)
+    .order_by(models.Auction.auctionID)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_STMT_AUCTIONS_BY_PRODUCT = (
+    select(models.Auction)
+    .where(models.Auction.productID == bindparam("product_id"))
+    .order_by(models.Auction.auctionID)
+)
+_STMT_AUCTIONS_BY_STATUS = (
+    select(models.Auction)
+    .where(models.Auction.auctionStatus.in_(bindparam("statuses", expanding=True)))
+    .order_by(models.Auction.auctionID)
+)
+
+
 def get_auction(db: Session, auction_id: int) -> models.Auction | None:
     """Get auction by ID"""
-    return db.query(models.Auction).filter(models.Auction.auctionID == auction_id).first()
+    return db.get(models.Auction, auction_id)
 
 
-def get_auctions(db: Session, skip: int = 0, limit: int = 100) -> List[models.Auction]:
+def get_auctions(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Auction]:
     """Get all auctions with pagination"""
-    return db.query(models.Auction).offset(skip).limit(limit).all()
+    return db.execute(
+        _STMT_AUCTIONS, {**_after_id(cursor, skip), "limit": limit}
+    ).scalars().all()
 
 
-def create_auction(db: Session, auction: schemas.AuctionCreate) -> models.Auction:
-    """Create new auction"""
+def get_auctions_by_product(db: Session, product_id: int) -> List[models.Auction]:
+    """Get all auctions of a product"""
+    return db.execute(_STMT_AUCTIONS_BY_PRODUCT, {"product_id": product_id}).scalars().all()
+
+
+def get_auctions_by_status(db: Session, statuses: List[str]) -> List[models.Auction]:
+    """Get all auctions in any of the given statuses"""
+    return db.execute(_STMT_AUCTIONS_BY_STATUS, {"statuses": statuses}).scalars().all()
+
+
+def stage_auction(db: Session, auction: schemas.AuctionCreate) -> models.Auction:
+    """Build a new auction and add it to the session; the caller commits"""
     db_auction = models.Auction(
         auctionName=auction.auctionName,
         productID=auction.productID,
         startDate=auction.startDate,
         endDate=auction.endDate,
         priceStep=auction.priceStep,
-        createdAt=datetime.utcnow(),
         auctionStatus="pending"
     )
     db.add(db_auction)
+    return db_auction
+
+
+def create_auction(db: Session, auction: schemas.AuctionCreate) -> models.Auction:
+    """Create new auction"""
+    db_auction = stage_auction(db, auction)
     db.commit()
-    db.refresh(db_auction)
     return db_auction
 
 
 def update_auction(db: Session, auction_id: int, auction_update: schemas.AuctionUpdate) -> models.Auction | None:
     """Update auction information"""
-    db_auction = get_auction(db, auction_id)
-    if not db_auction:
-        return None
-    
-    update_data = auction_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_auction, field, value)
-    
-    db_auction.updatedAt = datetime.utcnow()
+    update_data = auction_update.model_dump(exclude_unset=True)
+    result = db.execute(
+        update(models.Auction)
+        .where(models.Auction.auctionID == auction_id)
+        .values(**update_data, updatedAt=func.now())
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
-    db.refresh(db_auction)
-    return db_auction
+    if result.rowcount == 0:
+        return None
+    # updatedAt is set by the database, so reload over any instance already in the session
+    return db.get(models.Auction, auction_id, populate_existing=True)
 
 
 def delete_auction(db: Session, auction_id: int) -> bool:
@@ -210,88 +407,270 @@ def delete_auction(db: Session, auction_id: int) -> bool:
     
     db.delete(db_auction)
     db.commit()
+    _invalidate_highest_bid(auction_id)
     return True
 
 
+# On MySQL name search uses the FULLTEXT index in boolean mode, requiring a
+# prefix match on every word. Words shorter than InnoDB's minimum token size
+# (3) are not indexed, so such searches fall back to LIKE. Databases created
+# before the index existed also use LIKE until
+# migrations/auction_name_fulltext.sql has been run.
+_FULLTEXT_SEARCH = False
+_RE_SEARCH_WORD = re.compile(r"\w+")
+
+
+def detect_fulltext_search(bind=engine) -> bool:
+    """Use FULLTEXT name search if the auction table has its FULLTEXT index; called once at app startup"""
+    global _FULLTEXT_SEARCH
+    _FULLTEXT_SEARCH = False
+    if bind.dialect.name == "mysql":
+        with bind.connect() as connection:
+            indexes = inspect(connection).get_indexes(models.Auction.__tablename__)
+        _FULLTEXT_SEARCH = any(
+            index.get("dialect_options", {}).get("mysql_prefix") == "FULLTEXT"
+            and index["column_names"] == ["auctionName"]
+            for index in indexes
+        )
+    return _FULLTEXT_SEARCH
+
+
+def _fulltext_query(text: str) -> str | None:
+    words = _RE_SEARCH_WORD.findall(text)
+    if not words or any(len(word) < 3 for word in words):
+        return None
+    return " ".join(f"+{word}*" for word in words)
+
+
 def search_auctions(db: Session, search_params: schemas.AuctionSearch, skip: int = 0, limit: int = 100) -> List[models.Auction]:
     """Search auctions based on criteria"""
-    query = db.query(models.Auction)
+    # Each criterion is a lambda, so the cache key comes from the lambda code
+    # objects instead of a walk over a freshly built clause tree
+    stmt = lambda_stmt(lambda: select(models.Auction))
+    params = {"skip": skip, "limit": limit}
     
     if search_params.auctionName:
-        query = query.filter(models.Auction.auctionName.contains(search_params.auctionName))
+        fulltext = _fulltext_query(search_params.auctionName) if _FULLTEXT_SEARCH else None
+        if fulltext:
+            stmt += lambda s: s.where(
+                match(models.Auction.auctionName, against=bindparam("auction_name")).in_boolean_mode()
+            )
+            params["auction_name"] = fulltext
+        else:
+            stmt += lambda s: s.where(models.Auction.auctionName.contains(bindparam("auction_name")))
+            params["auction_name"] = search_params.auctionName
     
     if search_params.auctionStatus:
-        query = query.filter(models.Auction.auctionStatus == search_params.auctionStatus)
+        stmt += lambda s: s.where(models.Auction.auctionStatus == bindparam("auction_status"))
+        params["auction_status"] = search_params.auctionStatus
     
     if search_params.minPriceStep:
-        query = query.filter(models.Auction.priceStep >= search_params.minPriceStep)
+        stmt += lambda s: s.where(models.Auction.priceStep >= bindparam("min_price_step"))
+        params["min_price_step"] = search_params.minPriceStep
     
     if search_params.maxPriceStep:
-        query = query.filter(models.Auction.priceStep <= search_params.maxPriceStep)
+        stmt += lambda s: s.where(models.Auction.priceStep <= bindparam("max_price_step"))
+        params["max_price_step"] = search_params.maxPriceStep
+    
+    # The router filters on auction.product; load all products in one query
+    if search_params.productType:
+        stmt += lambda s: s.options(selectinload(models.Auction.product))
     
-    return query.offset(skip).limit(limit).all()
+    stmt += lambda s: s.offset(bindparam("skip")).limit(bindparam("limit"))
+    return db.execute(stmt, params).scalars().all()
 
 
 # ========== BID CRUD ========== #
+_STMT_BIDS_BY_AUCTION = (
+    select(models.Bid)
+    .where(
+        models.Bid.auctionID == bindparam("auction_id"),
+        or_(
+            _AFTER_ID.is_(None),
+            tuple_(models.Bid.bidPrice, models.Bid.bidID) < tuple_(bindparam("after_key", type_=Integer), _AFTER_ID)
+        )
+    )
+    .order_by(models.Bid.bidPrice.desc(), models.Bid.bidID.desc())
+    .options(_NO_LAZY)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_STMT_BIDDER_IDS_BY_AUCTION = (
+    select(models.Bid.userID)
+    .where(models.Bid.auctionID == bindparam("auction_id"))
+    .distinct()
+)
+_STMT_BID_COUNT_BY_AUCTION = (
+    select(func.count())
+    .select_from(models.Bid)
+    .where(models.Bid.auctionID == bindparam("auction_id"))
+)
+_STMT_BIDS_BY_USER = (
+    select(models.Bid)
+    .where(models.Bid.userID == bindparam("user_id"), models.Bid.bidID > _AFTER_ID)
+    .order_by(models.Bid.bidID)
+    .options(_NO_LAZY)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+
 def get_bid(db: Session, bid_id: int) -> models.Bid | None:
     """Get bid by ID"""
-    return db.query(models.Bid).filter(models.Bid.bidID == bid_id).first()
+    return db.get(models.Bid, bid_id)
+
 
+def get_bids_by_auction(db: Session, auction_id: int, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Bid]:
+    """Get all bids for an auction, highest first (cursor key: bidPrice)"""
+    return db.execute(
+        _STMT_BIDS_BY_AUCTION, {"auction_id": auction_id, **_after_key(cursor, skip), "limit": limit}
+    ).scalars().all()
 
-def get_bids_by_auction(db: Session, auction_id: int, skip: int = 0, limit: int = 100) -> List[models.Bid]:
-    """Get all bids for an auction"""
-    return db.query(models.Bid).filter(models.Bid.auctionID == auction_id).order_by(models.Bid.bidPrice.desc()).offset(skip).limit(limit).all()
 
+def get_bidder_ids_for_auction(db: Session, auction_id: int) -> set[int]:
+    """Get IDs of every user who has bid on an auction"""
+    return set(db.execute(_STMT_BIDDER_IDS_BY_AUCTION, {"auction_id": auction_id}).scalars())
 
-def get_bids_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Bid]:
+
+def count_bids_by_auction(db: Session, auction_id: int) -> int:
+    """Count all bids placed on an auction"""
+    return db.execute(_STMT_BID_COUNT_BY_AUCTION, {"auction_id": auction_id}).scalar_one()
+
+
+def get_bids_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Bid]:
     """Get all bids by a user"""
-    return db.query(models.Bid).filter(models.Bid.userID == user_id).offset(skip).limit(limit).all()
+    return db.execute(
+        _STMT_BIDS_BY_USER, {"user_id": user_id, **_after_id(cursor, skip), "limit": limit}
+    ).scalars().all()
 
 
-def create_bid(db: Session, bid: schemas.BidCreate, user_id: int) -> models.Bid:
-    """Create new bid"""
+# Highest active bid ID per auction (0 for none), read on every bid placement
+# and auction view. Bid writes in this process invalidate it; the short TTL
+# bounds staleness from other workers. A read that raced a write does not
+# store its result, which is what the generation counter is for.
+_highest_bid_cache: TTLCache = TTLCache(maxsize=4096, ttl=5)
+_highest_bid_lock = threading.Lock()
+_highest_bid_generation = 0
+
+
+def _invalidate_highest_bid(auction_id: int):
+    global _highest_bid_generation
+    with _highest_bid_lock:
+        _highest_bid_generation += 1
+        _highest_bid_cache.pop(auction_id, None)
+
+
+def stage_bid(db: Session, bid: schemas.BidCreate, user_id: int) -> models.Bid:
+    """Build a new bid and add it to the session; the caller commits"""
     db_bid = models.Bid(
         auctionID=bid.auctionID,
         userID=user_id,
         bidPrice=bid.bidPrice,
-        bidStatus="active",
-        createdAt=datetime.utcnow()
+        bidStatus=BidStatus.ACTIVE
     )
     db.add(db_bid)
+    return db_bid
+
+
+def create_bid(db: Session, bid: schemas.BidCreate, user_id: int) -> models.Bid:
+    """Create new bid"""
+    db_bid = stage_bid(db, bid, user_id)
     db.commit()
-    db.refresh(db_bid)
+    _invalidate_highest_bid(db_bid.auctionID)
     return db_bid
 
 
+# Bid placement locks the auction row, so concurrent bids on one auction are
+# checked and inserted one at a time. The highest bid is also read with a
+# locking read: under REPEATABLE READ a plain SELECT would see the snapshot
+# from the request's first query and miss bids committed since.
+_STMT_LOCK_AUCTION_FOR_BID = (
+    select(models.Auction.priceStep, models.Auction.endDate)
+    .where(models.Auction.auctionID == bindparam("auction_id"))
+    .with_for_update()
+)
+
+
+class BidPlacement(NamedTuple):
+    bid: Optional[models.Bid]  # None when the price was below min_price
+    previous_highest: Optional[models.Bid]
+    min_price: int
+
+
+def place_bid(db: Session, bid: schemas.BidCreate, user_id: int) -> BidPlacement | None:
+    """
+    Check a bid against the current highest bid and insert it in one transaction.
+    Returns None if the auction does not exist or has ended.
+    """
+    auction = db.execute(_STMT_LOCK_AUCTION_FOR_BID, {"auction_id": bid.auctionID}).first()
+    # Checked under the row lock, so a bid cannot land after the auction ends
+    if auction is None or auction.endDate <= datetime.utcnow():
+        db.rollback()
+        return None
+    price_step = auction.priceStep
+    
+    previous_highest = db.execute(_STMT_LOCK_HIGHEST_BID, {"auction_id": bid.auctionID}).scalar_one_or_none()
+    min_price = previous_highest.bidPrice + price_step if previous_highest else price_step
+    if bid.bidPrice < min_price:
+        db.rollback()
+        return BidPlacement(None, previous_highest, min_price)
+    
+    db_bid = stage_bid(db, bid, user_id)
+    db.commit()
+    _invalidate_highest_bid(bid.auctionID)
+    return BidPlacement(db_bid, previous_highest, min_price)
+
+
 def cancel_bid(db: Session, bid_id: int, user_id: int) -> bool:
     """Cancel a bid"""
-    db_bid = get_bid(db, bid_id)
-    if not db_bid or db_bid.userID != user_id:
+    # Ownership is checked in the WHERE clause. The cancelled bid may be the
+    # cached highest one, so that auction's cache entry is dropped; MySQL has
+    # no UPDATE ... RETURNING, so its auctionID is read by primary key.
+    result = db.execute(
+        update(models.Bid)
+        .where(models.Bid.bidID == bid_id, models.Bid.userID == user_id)
+        .values(bidStatus=BidStatus.CANCELLED)
+    )
+    if result.rowcount == 0:
+        db.rollback()
         return False
-    
-    db_bid.bidStatus = "cancelled"
+    auction_id = db.scalar(select(models.Bid.auctionID).where(models.Bid.bidID == bid_id))
     db.commit()
+    _invalidate_highest_bid(auction_id)
     return True
 
 
 # ========== PAYMENT CRUD ========== #
+_STMT_PAYMENTS_BY_USER = (
+    select(models.Payment)
+    .where(models.Payment.userID == bindparam("user_id"), models.Payment.paymentID > _AFTER_ID)
+    .order_by(models.Payment.paymentID)
+    .options(_NO_LAZY)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_STMT_PAYMENTS_BY_AUCTION = select(models.Payment).where(models.Payment.auctionID == bindparam("auction_id"))
+
+
 def get_payment(db: Session, payment_id: int) -> models.Payment | None:
     """Get payment by ID"""
-    return db.query(models.Payment).filter(models.Payment.paymentID == payment_id).first()
+    return db.get(models.Payment, payment_id)
 
 
-def get_payments_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Payment]:
+def get_payments_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Payment]:
     """Get all payments by a user"""
-    return db.query(models.Payment).filter(models.Payment.userID == user_id).offset(skip).limit(limit).all()
+    return db.execute(
+        _STMT_PAYMENTS_BY_USER, {"user_id": user_id, **_after_id(cursor, skip), "limit": limit}
+    ).scalars().all()
 
 
 def get_payments_by_auction(db: Session, auction_id: int) -> List[models.Payment]:
     """Get all payments for an auction"""
-    return db.query(models.Payment).filter(models.Payment.auctionID == auction_id).all()
+    return db.execute(_STMT_PAYMENTS_BY_AUCTION, {"auction_id": auction_id}).scalars().all()
 
 
-def create_payment(db: Session, payment: schemas.PaymentCreate, user_id: int) -> models.Payment:
-    """Create new payment"""
+def stage_payment(db: Session, payment: schemas.PaymentCreate, user_id: int) -> models.Payment:
+    """Build a new payment and add it to the session; the caller commits"""
     db_payment = models.Payment(
         auctionID=payment.auctionID,
         userID=user_id,
@@ -303,8 +682,13 @@ def create_payment(db: Session, payment: schemas.PaymentCreate, user_id: int) ->
         paymentStatus="pending"
     )
     db.add(db_payment)
+    return db_payment
+
+
+def create_payment(db: Session, payment: schemas.PaymentCreate, user_id: int) -> models.Payment:
+    """Create new payment"""
+    db_payment = stage_payment(db, payment, user_id)
     db.commit()
-    db.refresh(db_payment)
     return db_payment
 
 
@@ -316,91 +700,205 @@ def update_payment_status(db: Session, payment_id: int, status: str) -> models.P
     
     db_payment.paymentStatus = status
     db.commit()
-    db.refresh(db_payment)
     return db_payment
 
 
 # ========== UTILITY FUNCTIONS ========== #
 
+_STMT_HIGHEST_BID = (
+    select(models.Bid)
+    .where(models.Bid.auctionID == bindparam("auction_id"), models.Bid.bidStatus == BidStatus.ACTIVE)
+    .order_by(models.Bid.bidPrice.desc())
+    .limit(1)
+)
+_STMT_LOCK_HIGHEST_BID = _STMT_HIGHEST_BID.with_for_update()
+# The product is joined in the same query; bids are loaded with a second
+# IN query so the auction row is not repeated once per bid
+_STMT_AUCTION_WITH_DETAILS = (
+    select(models.Auction)
+    .options(joinedload(models.Auction.product), selectinload(models.Auction.bids))
+    .where(models.Auction.auctionID == bindparam("auction_id"))
+)
+_STMT_WON_AUCTIONS = select(models.Auction).where(models.Auction.bidWinnerID == bindparam("user_id"))
+
+
 def get_auction_with_details(db: Session, auction_id: int) -> models.Auction | None:
     """Get auction with product and bid details"""
-    return db.query(models.Auction).filter(models.Auction.auctionID == auction_id).first()
+    return db.execute(_STMT_AUCTION_WITH_DETAILS, {"auction_id": auction_id}).scalar_one_or_none()
 
 
 def get_current_highest_bid(db: Session, auction_id: int) -> models.Bid | None:
     """Get the current highest bid for an auction"""
-    return db.query(models.Bid).filter(
-        models.Bid.auctionID == auction_id,
-        models.Bid.bidStatus == "active"
-    ).order_by(models.Bid.bidPrice.desc()).first()
+    with _highest_bid_lock:
+        cached_id = _highest_bid_cache.get(auction_id)
+        generation = _highest_bid_generation
+    if cached_id == 0:
+        return None
+    if cached_id is not None:
+        # Usually already in the identity map; otherwise a primary-key lookup
+        db_bid = db.get(models.Bid, cached_id)
+        if db_bid is not None and db_bid.bidStatus == BidStatus.ACTIVE:
+            return db_bid
+    
+    db_bid = db.execute(_STMT_HIGHEST_BID, {"auction_id": auction_id}).scalar_one_or_none()
+    with _highest_bid_lock:
+        if generation == _highest_bid_generation:
+            _highest_bid_cache[auction_id] = db_bid.bidID if db_bid else 0
+    return db_bid
 
 
 def get_user_won_auctions(db: Session, user_id: int) -> List[models.Auction]:
     """Get auctions won by a user"""
-    return db.query(models.Auction).filter(models.Auction.bidWinnerID == user_id).all()
+    return db.execute(_STMT_WON_AUCTIONS, {"user_id": user_id}).scalars().all()
 
 
 # ========== NOTIFICATION CRUD ========== #
+_NOTIFICATION_AFTER = or_(
+    _AFTER_ID.is_(None),
+    tuple_(models.Notification.createdAt, models.Notification.notificationID)
+    < tuple_(bindparam("after_key", type_=DateTime), _AFTER_ID)
+)
+_STMT_NOTIFICATIONS_BY_USER = (
+    select(models.Notification)
+    .where(models.Notification.userID == bindparam("user_id"), _NOTIFICATION_AFTER)
+    .order_by(models.Notification.createdAt.desc(), models.Notification.notificationID.desc())
+    .options(_NO_LAZY)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_STMT_UNREAD_NOTIFICATIONS_BY_USER = (
+    select(models.Notification)
+    .where(
+        models.Notification.userID == bindparam("user_id"),
+        models.Notification.isRead == False,
+        _NOTIFICATION_AFTER
+    )
+    .order_by(models.Notification.createdAt.desc(), models.Notification.notificationID.desc())
+    .options(_NO_LAZY)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_STMT_NOTIFICATIONS_BY_USER_AND_AUCTION = (
+    select(models.Notification)
+    .where(
+        models.Notification.userID == bindparam("user_id"),
+        models.Notification.auctionID == bindparam("auction_id")
+    )
+    .order_by(models.Notification.createdAt.desc(), models.Notification.notificationID.desc())
+    .options(_NO_LAZY)
+)
+_STMT_UNREAD_COUNT = (
+    select(func.count())
+    .select_from(models.Notification)
+    .where(models.Notification.userID == bindparam("user_id"), models.Notification.isRead == False)
+)
+# Badge checks stop reading the (userID, isRead, ...) index after the first row,
+# or after `cap` rows, instead of counting every unread notification
+_STMT_UNREAD_IDS = (
+    select(models.Notification.notificationID)
+    .where(models.Notification.userID == bindparam("user_id"), models.Notification.isRead == False)
+)
+_STMT_HAS_UNREAD = _STMT_UNREAD_IDS.limit(1)
+_STMT_UNREAD_COUNT_CAPPED = select(func.count()).select_from(
+    _STMT_UNREAD_IDS.limit(bindparam("cap")).subquery()
+)
+
+
 def get_notification(db: Session, notification_id: int) -> models.Notification | None:
     """Get notification by ID"""
-    return db.query(models.Notification).filter(models.Notification.notificationID == notification_id).first()
+    return db.get(models.Notification, notification_id)
 
 
-def get_notifications_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Notification]:
-    """Get all notifications for a user"""
-    return db.query(models.Notification).filter(
-        models.Notification.userID == user_id
-    ).order_by(models.Notification.createdAt.desc()).offset(skip).limit(limit).all()
+def get_notifications_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Notification]:
+    """Get all notifications for a user, newest first (cursor key: createdAt)"""
+    return db.execute(
+        _STMT_NOTIFICATIONS_BY_USER, {"user_id": user_id, **_after_key(cursor, skip), "limit": limit}
+    ).scalars().all()
 
 
-def get_unread_notifications_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Notification]:
-    """Get unread notifications for a user"""
-    return db.query(models.Notification).filter(
-        models.Notification.userID == user_id,
-        models.Notification.isRead == False
-    ).order_by(models.Notification.createdAt.desc()).offset(skip).limit(limit).all()
+def get_unread_notifications_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Notification]:
+    """Get unread notifications for a user, newest first (cursor key: createdAt)"""
+    return db.execute(
+        _STMT_UNREAD_NOTIFICATIONS_BY_USER, {"user_id": user_id, **_after_key(cursor, skip), "limit": limit}
+    ).scalars().all()
 
 
-def create_notification(db: Session, notification: schemas.NotificationCreate) -> models.Notification:
-    """Create new notification"""
-    db_notification = models.Notification(
-        userID=notification.userID,
-        auctionID=notification.auctionID,
-        notificationType=notification.notificationType,
-        title=notification.title,
-        message=notification.message,
-        isRead=False,
-        isSent=False,
-        createdAt=datetime.utcnow()
+# Async variants for endpoints served on the event loop; they run the same
+# prebuilt statements on an AsyncSession
+async def aget_notifications_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Notification]:
+    """Get all notifications for a user, newest first (cursor key: createdAt)"""
+    result = await db.execute(
+        _STMT_NOTIFICATIONS_BY_USER, {"user_id": user_id, **_after_key(cursor, skip), "limit": limit}
+    )
+    return result.scalars().all()
+
+
+async def aget_unread_notifications_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[schemas.Cursor] = None) -> List[models.Notification]:
+    """Get unread notifications for a user, newest first (cursor key: createdAt)"""
+    result = await db.execute(
+        _STMT_UNREAD_NOTIFICATIONS_BY_USER, {"user_id": user_id, **_after_key(cursor, skip), "limit": limit}
     )
+    return result.scalars().all()
+
+
+def get_notifications_by_user_and_auction(db: Session, user_id: int, auction_id: int) -> List[models.Notification]:
+    """Get a user's notifications about one auction, newest first"""
+    return db.execute(
+        _STMT_NOTIFICATIONS_BY_USER_AND_AUCTION, {"user_id": user_id, "auction_id": auction_id}
+    ).scalars().all()
+
+
+def _notification_values(notification: schemas.NotificationCreate) -> dict:
+    return {
+        "userID": notification.userID,
+        "auctionID": notification.auctionID,
+        "notificationType": notification.notificationType,
+        "title": notification.title,
+        "message": notification.message,
+        "isRead": False,
+        "isSent": False
+    }
+
+
+def stage_notification(db: Session, notification: schemas.NotificationCreate) -> models.Notification:
+    """Build a new notification and add it to the session; the caller commits"""
+    db_notification = models.Notification(**_notification_values(notification))
     db.add(db_notification)
+    return db_notification
+
+
+def create_notification(db: Session, notification: schemas.NotificationCreate) -> models.Notification:
+    """Create new notification"""
+    db_notification = stage_notification(db, notification)
     db.commit()
-    db.refresh(db_notification)
     return db_notification
 
 
-def create_outbid_notification(db: Session, auction_id: int, outbid_user_id: int, new_bidder_id: int, new_bid_price: int) -> models.Notification:
-    """Create notification when user is outbid"""
-    # Get auction and user information
-    auction = get_auction(db, auction_id)
-    new_bidder = get_account_by_id(db, new_bidder_id)
-    
-    if not auction or not new_bidder:
-        return None
-    
+_STMT_AUCTION_AND_BIDDER = (
+    select(
+        models.Auction.auctionName,
+        models.Account.firstName,
+        models.Account.lastName,
+        models.Account.username
+    )
+    .select_from(models.Auction)
+    .join(models.Account, models.Account.accountID == bindparam("bidder_id"))
+    .where(models.Auction.auctionID == bindparam("auction_id"))
+)
+
+
+def _stage_outbid_notification(db: Session, auction_id: int, outbid_user_id: int, new_bid_price: int, details: Row) -> models.Notification:
+    """Build an outbid notification and add it to the session without committing"""
     db_notification = models.Notification(
         userID=outbid_user_id,
         auctionID=auction_id,
         notificationType="bid_outbid",
         title="You have been outbid!",
-        message=f"{new_bidder.firstName or new_bidder.username} placed a higher bid of {new_bid_price:,} VND on {auction.auctionName}",
+        message=f"{details.firstName or details.username} placed a higher bid of {new_bid_price:,} VND on {details.auctionName}",
         isRead=False,
-        isSent=False,
-        createdAt=datetime.utcnow()
+        isSent=False
     )
     db.add(db_notification)
-    db.commit()
-    db.refresh(db_notification)
     return db_notification
 
 
@@ -412,104 +910,202 @@ def update_notification_status(db: Session, notification_id: int, is_read: bool
     
     db_notification.isRead = is_read
     if is_read:
-        db_notification.readAt = datetime.utcnow()
+        db_notification.readAt = func.now()
     
     db.commit()
-    db.refresh(db_notification)
     return db_notification
 
 
+_STMT_MARK_ALL_READ = (
+    update(models.Notification)
+    .where(models.Notification.userID == bindparam("user_id"), models.Notification.isRead == False)
+    .values(isRead=True, readAt=func.now())
+    .execution_options(synchronize_session=False)
+)
+
+
 def mark_all_notifications_read(db: Session, user_id: int) -> bool:
     """Mark all user notifications as read"""
-    notifications = get_unread_notifications_by_user(db, user_id, skip=0, limit=1000)
-    for notification in notifications:
-        notification.isRead = True
-        notification.readAt = datetime.utcnow()
-    
+    db.execute(_STMT_MARK_ALL_READ, {"user_id": user_id})
     db.commit()
     return True
 
 
 def delete_notification(db: Session, notification_id: int) -> bool:
     """Delete notification"""
-    db_notification = get_notification(db, notification_id)
-    if not db_notification:
-        return False
-    
-    db.delete(db_notification)
+    result = db.execute(delete(models.Notification).where(models.Notification.notificationID == notification_id))
     db.commit()
-    return True
+    return result.rowcount > 0
 
 
 def get_unread_count(db: Session, user_id: int) -> int:
     """Get count of unread notifications for user"""
-    return db.query(models.Notification).filter(
-        models.Notification.userID == user_id,
-        models.Notification.isRead == False
-    ).count()
+    return db.execute(_STMT_UNREAD_COUNT, {"user_id": user_id}).scalar_one()
+
+
+def get_unread_count_capped(db: Session, user_id: int, cap: int = 100) -> int:
+    """Get count of unread notifications for user, counting at most `cap`"""
+    return db.execute(_STMT_UNREAD_COUNT_CAPPED, {"user_id": user_id, "cap": cap}).scalar_one()
+
+
+def has_unread(db: Session, user_id: int) -> bool:
+    """Check whether the user has any unread notification"""
+    return db.execute(_STMT_HAS_UNREAD, {"user_id": user_id}).first() is not None
+
+
+async def aget_unread_count(db: AsyncSession, user_id: int) -> int:
+    """Get count of unread notifications for user"""
+    return (await db.execute(_STMT_UNREAD_COUNT, {"user_id": user_id})).scalar_one()
+
+
+async def aget_unread_count_capped(db: AsyncSession, user_id: int, cap: int = 100) -> int:
+    """Get count of unread notifications for user, counting at most `cap`"""
+    return (await db.execute(_STMT_UNREAD_COUNT_CAPPED, {"user_id": user_id, "cap": cap})).scalar_one()
+
+
+async def ahas_unread(db: AsyncSession, user_id: int) -> bool:
+    """Check whether the user has any unread notification"""
+    return (await db.execute(_STMT_HAS_UNREAD, {"user_id": user_id})).first() is not None
 
 
 # ========== WEBSOCKET CONNECTION MANAGEMENT ========== #
 import asyncio
-from typing import Set, Dict
-from fastapi import WebSocket
-
-# Global connection storage
-active_connections: Dict[int, Set[WebSocket]] = {}
-connection_lock = asyncio.Lock()
+from typing import Dict
+from fastapi import WebSocket, WebSocketDisconnect
+
+# Each connection gets its own outgoing queue drained by a writer task, so a
+# slow client only delays its own messages. All registry updates happen
+# between awaits on the event loop, so no lock is needed.
+active_connections: Dict[int, Dict[WebSocket, asyncio.Queue]] = {}
+_writer_tasks: Dict[WebSocket, asyncio.Task] = {}
+# The event loop only keeps weak references to tasks, so close tasks are held
+# here until they finish
+_close_tasks: set[asyncio.Task] = set()
+
+# A client that falls this far behind is disconnected rather than buffered
+# without bound; it reconnects and reloads state over HTTP.
+_SEND_QUEUE_SIZE = 256
+
+
+def _discard_connection(user_id: int, websocket: WebSocket):
+    """Drop a connection from the registry"""
+    connections = active_connections.get(user_id)
+    if connections is not None:
+        connections.pop(websocket, None)
+        if not connections:
+            del active_connections[user_id]
+
+
+async def _connection_writer(user_id: int, websocket: WebSocket, queue: asyncio.Queue):
+    """Send queued messages to one WebSocket until the client goes away"""
+    try:
+        while True:
+            await websocket.send_text(await queue.get())
+    except (WebSocketDisconnect, RuntimeError, OSError):
+        # Client disconnected, or the socket was already closed; the server
+        # reports a dropped connection as an OSError subclass
+        pass
+    finally:
+        # Also runs on cancellation and unexpected errors, which propagate
+        _discard_connection(user_id, websocket)
+        _writer_tasks.pop(websocket, None)
 
 
 async def add_connection(user_id: int, websocket: WebSocket):
     """Add WebSocket connection for user"""
-    async with connection_lock:
-        if user_id not in active_connections:
-            active_connections[user_id] = set()
-        active_connections[user_id].add(websocket)
+    queue = asyncio.Queue(maxsize=_SEND_QUEUE_SIZE)
+    active_connections.setdefault(user_id, {})[websocket] = queue
+    _writer_tasks[websocket] = asyncio.create_task(_connection_writer(user_id, websocket, queue))
 
 
 async def remove_connection(user_id: int, websocket: WebSocket):
     """Remove WebSocket connection for user"""
-    async with connection_lock:
-        if user_id in active_connections:
-            active_connections[user_id].discard(websocket)
-            if not active_connections[user_id]:
-                del active_connections[user_id]
+    _discard_connection(user_id, websocket)
+    task = _writer_tasks.pop(websocket, None)
+    if task is not None:
+        task.cancel()
+
+
+async def _close_lagging_connection(websocket: WebSocket):
+    """Close a connection whose send queue overflowed"""
+    try:
+        await websocket.close(code=1013)  # Try again later
+    except Exception:
+        pass
+
+
+def _drop_lagging_connection(user_id: int, websocket: WebSocket):
+    """Unregister a connection that cannot keep up and close it"""
+    _discard_connection(user_id, websocket)
+    task = _writer_tasks.pop(websocket, None)
+    if task is not None:
+        task.cancel()
+    close_task = asyncio.create_task(_close_lagging_connection(websocket))
+    _close_tasks.add(close_task)
+    close_task.add_done_callback(_close_tasks.discard)
+
+
+def send_text_to_user(user_id: int, payload: str):
+    """Queue an already-encoded JSON message on every connection of a user"""
+    connections = active_connections.get(user_id)
+    if not connections:
+        return
+    
+    lagging = []
+    for websocket, queue in connections.items():
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            lagging.append(websocket)
+    
+    for websocket in lagging:
+        _drop_lagging_connection(user_id, websocket)
+
+
+def send_to_connection(user_id: int, websocket: WebSocket, message: dict):
+    """Queue a message on a single registered connection
+
+    Endpoints reply through here rather than writing to the socket
+    themselves, so each socket has exactly one writer.
+    """
+    connections = active_connections.get(user_id)
+    queue = connections.get(websocket) if connections else None
+    if queue is None:
+        return
+    
+    try:
+        queue.put_nowait(orjson.dumps(message).decode())
+    except asyncio.QueueFull:
+        _drop_lagging_connection(user_id, websocket)
 
 
 async def send_to_user(user_id: int, message: dict):
     """Send message to specific user via WebSocket"""
-    async with connection_lock:
-        connections = active_connections.get(user_id, set())
-        disconnected = set()
-        
-        for websocket in connections:
-            try:
-                await websocket.send_json(message)
-            except:
-                disconnected.add(websocket)
-        
-        # Remove disconnected connections
-        for websocket in disconnected:
-            connections.discard(websocket)
+    if user_id in active_connections:
+        send_text_to_user(user_id, orjson.dumps(message).decode())
 
 
-async def broadcast_to_auction_participants(db: Session, auction_id: int, message: dict):
+# The helpers below run on the event loop, often as fire-and-forget tasks that
+# outlive the request, so they open their own AsyncSession instead of blocking
+# the loop on the request's sync Session.
+async def broadcast_to_auction_participants(auction_id: int, message: dict):
     """Send message to all participants in an auction"""
-    # Get all users who have bid on this auction
-    bids = get_bids_by_auction(db, auction_id)
-    user_ids = set(bid.userID for bid in bids)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(_STMT_BIDDER_IDS_BY_AUCTION, {"auction_id": auction_id})
+        user_ids = set(result.scalars())
     
-    # Send to each participant
+    # Encode once and send the same payload to each participant
+    payload = orjson.dumps(message).decode()
     for user_id in user_ids:
-        await send_to_user(user_id, message)
+        send_text_to_user(user_id, payload)
 
 
 # Notification service functions
-async def create_and_send_notification(db: Session, notification: schemas.NotificationCreate, websocket_message: dict = None):
+async def create_and_send_notification(notification: schemas.NotificationCreate, websocket_message: dict = None):
     """Create notification and send via WebSocket"""
-    db_notification = create_notification(db, notification)
-    if not db_notification:
-        return None
+    async with AsyncSessionLocal() as db:
+        db_notification = stage_notification(db, notification)
+        await db.commit()
     
     # Send via WebSocket if message provided
     if websocket_message:
@@ -518,28 +1114,30 @@ async def create_and_send_notification(db: Session, notification: schemas.Notifi
     return db_notification
 
 
-async def notify_bid_outbid(db: Session, auction_id: int, outbid_user_id: int, new_bidder_id: int, new_bid_price: int):
+async def notify_bid_outbid(auction_id: int, outbid_user_id: int, new_bidder_id: int, new_bid_price: int):
     """Create and send outbid notification"""
-    # Create notification
-    notification = create_outbid_notification(db, auction_id, outbid_user_id, new_bidder_id, new_bid_price)
-    
-    if notification:
-        # Get auction and bidder info for WebSocket message
-        auction = get_auction(db, auction_id)
-        new_bidder = get_account_by_id(db, new_bidder_id)
-        
-        websocket_message = {
-            "type": "bid_outbid",
-            "data": {
-                "auction_id": auction_id,
-                "auction_name": auction.auctionName if auction else "Auction",
-                "new_bid_price": new_bid_price,
-                "new_bidder_name": f"{new_bidder.firstName} {new_bidder.lastName}".strip() if new_bidder else "Someone",
-                "notification_id": notification.notificationID
-            },
-            "timestamp": datetime.utcnow().isoformat()
-        }
+    async with AsyncSessionLocal() as db:
+        # Auction and bidder are loaded once and shared by the notification and the WebSocket message
+        result = await db.execute(_STMT_AUCTION_AND_BIDDER, {"auction_id": auction_id, "bidder_id": new_bidder_id})
+        details = result.first()
+        if not details:
+            return None
         
-        await send_to_user(outbid_user_id, websocket_message)
+        notification = _stage_outbid_notification(db, auction_id, outbid_user_id, new_bid_price, details)
+        await db.commit()
+    
+    websocket_message = {
+        "type": "bid_outbid",
+        "data": {
+            "auction_id": auction_id,
+            "auction_name": details.auctionName,
+            "new_bid_price": new_bid_price,
+            "new_bidder_name": f"{details.firstName} {details.lastName}".strip(),
+            "notification_id": notification.notificationID
+        },
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    
+    await send_to_user(outbid_user_id, websocket_message)
     
     return notification
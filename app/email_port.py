@@ -3,13 +3,478 @@ EmailPort - Email service interface Gateway để giao tiếp với dịch vụ
 Class cổng để xử lý việc gửi email qua SMTP
 """
 import asyncio
-from datetime import datetime
+import html
+import logging
+import re
+import textwrap
+import time
+from collections import deque
+from dataclasses import dataclass
+from email import message_from_bytes, policy
+from datetime import datetime, timedelta, timezone
+from email.header import Header
 from email.message import EmailMessage
-from typing import Optional
+from email.utils import formataddr, formatdate
+from string import Template
+from typing import List, Optional, Tuple, TypedDict, Union
 import aiosmtplib
-from jose import jwt, JWTError
 from configs.config_mail import mail_settings
-from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# HTML email templates. Every email shares the outer layout in _BASE_TEMPLATE;
+# _extend() fills in its blocks at import, leaving the per-email fields as
+# placeholders. The results are split into byte segments and rendered with
+# _render_bytes(), which HTML-escapes every field value.
+
+_BASE_TEMPLATE = Template("""\
+<!DOCTYPE html>
+<html lang="vi">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$subject</title>
+</head>
+<body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f5f5f5;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 20px 0;">
+        <tr>
+            <td align="center">
+                <table width="500" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;">
+                    <!-- Header -->
+                    <tr>
+                        <td style="background: linear-gradient(135deg, $header_gradient); padding: 30px; text-align: center;">
+                            <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: 300;">
+                                $heading
+                            </h1>
+                        </td>
+                    </tr>
+
+                    <!-- Content -->
+                    <tr>
+                        <td style="$content_style">
+$content                        </td>
+                    </tr>
+$footer_rows                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>
+""")
+
+
+def _extend(header_gradient: str, heading: str, content: str,
+            content_style: str = "padding: 40px 30px;", footer_rows: str = "") -> Template:
+    """Build an email template from the base layout and its content blocks"""
+    return Template(_BASE_TEMPLATE.safe_substitute(
+        header_gradient=header_gradient,
+        heading=heading,
+        content_style=content_style,
+        content=textwrap.indent(content, " " * 28),
+        footer_rows=textwrap.indent(footer_rows, " " * 20)
+    ))
+
+
+# OTP xác minh
+_OTP_TEMPLATE = _extend(
+    header_gradient="#667eea 0%, #764ba2 100%",
+    heading="Auction System",
+    content="""\
+<!-- Greeting -->
+<p style="font-size: 18px; color: #333333; margin: 0 0 20px 0; line-height: 1.5;">
+    $greeting
+</p>
+
+<!-- Purpose Message -->
+<p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
+    $purpose_msg
+</p>
+
+<!-- OTP Code Box -->
+<div style="text-align: center; margin: 40px 0;">
+    <div style="display: inline-block; background-color: #f8f9fa; border: 2px solid #e9ecef; border-radius: 8px; padding: 20px; min-width: 200px;">
+        <p style="font-size: 14px; color: #6c757d; margin: 0 0 10px 0; font-weight: 500;">
+            Mã xác minh của bạn:
+        </p>
+        <h2 style="font-family: 'Courier New', monospace; font-size: 32px; color: #495057; margin: 0; letter-spacing: 8px; font-weight: bold;">
+            $otp
+        </h2>
+    </div>
+</div>
+
+<!-- Warning -->
+<div style="background-color: #fff3cd; border: 1px solid #ffeaa7; border-radius: 6px; padding: 15px; margin: 30px 0;">
+    <p style="font-size: 14px; color: #856404; margin: 0; line-height: 1.5;">
+        <strong>Lưu ý quan trọng:</strong><br>
+        $warning_msg<br>
+        <strong>KHÔNG chia sẻ mã này với bất kỳ ai, kể cả nhân viên hỗ trợ.</strong>
+    </p>
+</div>
+
+<!-- Footer -->
+<div style="border-top: 1px solid #e9ecef; padding-top: 20px; margin-top: 40px;">
+    <p style="font-size: 12px; color: #6c757d; margin: 0 0 10px 0; line-height: 1.4;">
+        Nếu bạn có bất kỳ câu hỏi nào, vui lòng liên hệ với đội ngũ hỗ trợ tại $support_email
+    </p>
+    <p style="font-size: 12px; color: #6c757d; margin: 0; line-height: 1.4;">
+        Email này được gửi tự động, vui lòng không trả lời email này.
+    </p>
+</div>
+""",
+    footer_rows="""\
+
+<!-- Footer Strip -->
+<tr>
+    <td style="background-color: #f8f9fa; padding: 20px; text-align: center;">
+        <p style="font-size: 12px; color: #6c757d; margin: 0;">
+            © 2024 Auction System. Tất cả quyền được bảo lưu.
+        </p>
+    </td>
+</tr>
+"""
+)
+
+# Chào mừng sau khi đăng ký
+_WELCOME_TEMPLATE = _extend(
+    header_gradient="#667eea 0%, #764ba2 100%",
+    heading="Chào mừng đến với Auction System!",
+    content_style="padding: 40px 30px; text-align: center;",
+    content="""\
+<h2 style="font-size: 20px; color: #333333; margin: 0 0 20px 0;">
+    Xin chào $username!
+</h2>
+
+<p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
+    Cảm ơn bạn đã đăng ký tài khoản tại Auction System. 
+    Email của bạn đã được xác minh thành công và tài khoản đã được kích hoạt.
+</p>
+
+<div style="background-color: #e3f2fd; border: 1px solid #2196f3; border-radius: 6px; padding: 20px; margin: 30px 0;">
+    <p style="font-size: 14px; color: #1565c0; margin: 0; line-height: 1.5;">
+        <strong>Bây giờ bạn có thể:</strong><br>
+        • Đăng nhập vào tài khoản<br>
+        • Tham gia đấu giá sản phẩm<br>
+        • Đặt giá thầu và giành chiến thắng<br>
+        • Quản lý thông tin cá nhân
+    </p>
+</div>
+
+<p style="font-size: 14px; color: #666666; margin: 30px 0 20px 0; line-height: 1.6;">
+    Nếu bạn có bất kỳ câu hỏi nào, đừng ngần ngại liên hệ với chúng tôi.
+</p>
+
+<div style="border-top: 1px solid #e9ecef; padding-top: 20px; margin-top: 30px;">
+    <p style="font-size: 12px; color: #6c757d; margin: 0;">
+        Trân trọng,<br>
+        Đội ngũ Auction System
+    </p>
+</div>
+"""
+)
+
+# Yêu cầu thanh toán đặt cọc
+_DEPOSIT_TEMPLATE = _extend(
+    header_gradient="#ff6b6b 0%, #ee5a24 100%",
+    heading="Thanh toán đặt cọc tham gia đấu giá",
+    content="""\
+<p style="font-size: 18px; color: #333333; margin: 0 0 20px 0; line-height: 1.5;">
+    Xin chào $username!
+</p>
+
+<div style="background-color: #f8f9fa; border: 1px solid #e9ecef; border-radius: 8px; padding: 20px; margin: 20px 0;">
+    <h3 style="font-size: 18px; color: #333333; margin: 0 0 15px 0;">
+        $auction_name
+    </h3>
+    <p style="font-size: 16px; color: #495057; margin: 0; font-weight: bold;">
+        Số tiền đặt cọc: <span style="color: #dc3545;">$amount VND</span>
+    </p>
+</div>
+
+<p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
+    Để hoàn tất đăng ký tham gia đấu giá, vui lòng thực hiện thanh toán đặt cọc 
+    trong thời gian quy định.
+</p>
+
+<div style="text-align: center; margin: 30px 0;">
+    <p style="font-size: 14px; color: #666666; margin: 20px 0;">
+        <a href="$qr_url" style="color: #007bff; text-decoration: none;">Click vào đây để thanh toán trên web</a>
+    </p>
+</div>
+
+<div style="background-color: #fff3cd; border: 1px solid #ffeaa7; border-radius: 6px; padding: 15px; margin: 30px 0;">
+    <p style="font-size: 14px; color: #856404; margin: 0; line-height: 1.5;">
+        <strong>⚠️ QUAN TRỌNG:</strong><br>
+        Mã thanh toán sẽ hết hạn sau <span style="font-weight: bold;">$remaining_minutes phút</span>!
+    </p>
+</div>
+
+<p style="font-size: 12px; color: #6c757d; margin: 0 0 10px 0; line-height: 1.4;">
+    Liên hệ hỗ trợ: $support_email
+</p>
+"""
+)
+
+# Yêu cầu thanh toán cuối
+_FINAL_PAYMENT_TEMPLATE = _extend(
+    header_gradient="#28a745 0%, #20c997 100%",
+    heading="🎉 Chúc mừng! Bạn đã thắng đấu giá",
+    content="""\
+<div style="background-color: #d4edda; border: 1px solid #c3e6cb; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
+    <h2 style="font-size: 24px; color: #155724; margin: 0 0 15px 0;">
+        Xin chúc mừng $username!
+    </h2>
+</div>
+
+<div style="background-color: #f8f9fa; border: 1px solid #e9ecef; border-radius: 8px; padding: 20px; margin: 20px 0;">
+    <h3 style="font-size: 18px; color: #333333; margin: 0 0 15px 0;">
+        $auction_name
+    </h3>
+    <p style="font-size: 16px; color: #495057; margin: 0; font-weight: bold;">
+        Số tiền thanh toán: <span style="color: #28a745;">$amount VND</span>
+    </p>
+</div>
+
+<p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
+    Để hoàn tất giao dịch, vui lòng thực hiện thanh toán số tiền còn lại 
+    trong vòng 24 giờ.
+</p>
+
+<div style="text-align: center; margin: 30px 0;">
+    <p style="font-size: 14px; color: #666666; margin: 20px 0;">
+        <a href="$qr_url" style="color: #007bff; text-decoration: none;">Click vào đây để thanh toán trên web</a>
+    </p>
+</div>
+
+<div style="background-color: #e3f2fd; border: 1px solid #2196f3; border-radius: 6px; padding: 15px; margin: 30px 0;">
+    <p style="font-size: 14px; color: #1565c0; margin: 0; line-height: 1.5;">
+        <strong>⏰ Thời hạn thanh toán:</strong><br>
+        Mã thanh toán có hiệu lực trong <span style="font-weight: bold;">$remaining_hours giờ</span>.
+    </p>
+</div>
+
+<p style="font-size: 12px; color: #6c757d; margin: 0 0 10px 0; line-height: 1.4;">
+    Liên hệ hỗ trợ: $support_email
+</p>
+"""
+)
+
+# Xác nhận thanh toán thành công
+_PAYMENT_CONFIRMATION_TEMPLATE = _extend(
+    header_gradient="#28a745 0%, #20c997 100%",
+    heading="$subject",
+    content_style="padding: 40px 30px; text-align: center;",
+    content="""\
+<div style="margin: 0 0 30px 0;">
+    <div style="width: 80px; height: 80px; background-color: #28a745; border-radius: 50%; display: inline-flex; align-items: center; justify-content: center; font-size: 40px; color: white;">
+        ✓
+    </div>
+</div>
+
+<h2 style="font-size: 24px; color: #333333; margin: 0 0 20px 0;">
+    Xin chúc mừng $username!
+</h2>
+
+<p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
+    Chúng tôi đã nhận được thanh toán của bạn một cách thành công.
+</p>
+
+<div style="background-color: #f8f9fa; border: 1px solid #e9ecef; border-radius: 8px; padding: 25px; margin: 30px 0; text-align: left;">
+    <h3 style="font-size: 18px; color: #333333; margin: 0 0 20px 0; text-align: center;">
+        Chi tiết thanh toán
+    </h3>
+
+    <table style="width: 100%;">
+        <tr>
+            <td style="padding: 8px 0; font-size: 14px; color: #6c757d; width: 40%;">
+                Loại thanh toán:
+            </td>
+            <td style="padding: 8px 0; font-size: 14px; color: #333333; font-weight: bold;">
+                $payment_type_text
+            </td>
+        </tr>
+        <tr>
+            <td style="padding: 8px 0; font-size: 14px; color: #6c757d;">
+                Sản phẩm đấu giá:
+            </td>
+            <td style="padding: 8px 0; font-size: 14px; color: #333333; font-weight: bold;">
+                $auction_name
+            </td>
+        </tr>
+        <tr>
+            <td style="padding: 8px 0; font-size: 14px; color: #6c757d;">
+                Số tiền:
+            </td>
+            <td style="padding: 8px 0; font-size: 14px; color: #28a745; font-weight: bold; font-size: 16px;">
+                $amount VND
+            </td>
+        </tr>
+        <tr>
+            <td style="padding: 8px 0; font-size: 14px; color: #6c757d;">
+                Phương thức thanh toán:
+            </td>
+            <td style="padding: 8px 0; font-size: 14px; color: #333333;">
+                $payment_method
+            </td>
+        </tr>
+        <tr>
+            <td style="padding: 8px 0; font-size: 14px; color: #6c757d;">
+                Thời gian thanh toán:
+            </td>
+            <td style="padding: 8px 0; font-size: 14px; color: #333333;">
+                $paid_at
+            </td>
+        </tr>
+    </table>
+</div>
+
+<div style="background-color: #e3f2fd; border: 1px solid #2196f3; border-radius: 6px; padding: 20px; margin: 30px 0;">
+    <p style="font-size: 14px; color: #1565c0; margin: 0; line-height: 1.5;">
+        <strong>Bước tiếp theo:</strong><br>
+        $next_steps
+    </p>
+</div>
+
+<p style="font-size: 14px; color: #666666; margin: 30px 0 20px 0; line-height: 1.6;">
+    Cảm ơn bạn đã sử dụng dịch vụ của chúng tôi.
+</p>
+
+<div style="border-top: 1px solid #e9ecef; padding-top: 20px; margin-top: 30px;">
+    <p style="font-size: 12px; color: #6c757d; margin: 0;">
+        Trân trọng,<br>
+        Đội ngũ Auction System
+    </p>
+</div>
+"""
+)
+
+
+_TEMPLATES = {
+    "otp": _OTP_TEMPLATE,
+    "welcome": _WELCOME_TEMPLATE,
+    "deposit": _DEPOSIT_TEMPLATE,
+    "final_payment": _FINAL_PAYMENT_TEMPLATE,
+    "payment_confirmation": _PAYMENT_CONFIRMATION_TEMPLATE,
+}
+
+
+def _split_template(template: Template) -> tuple:
+    """
+    Split a template once into its leading static text and (field name,
+    following static text) pairs, with the static text pre-encoded to UTF-8
+    """
+    text = template.template
+    fields = []
+    statics = []
+    pos = 0
+    for match in template.pattern.finditer(text):
+        statics.append(text[pos:match.start()].encode())
+        fields.append(match.group("named") or match.group("braced"))
+        pos = match.end()
+    statics.append(text[pos:].encode())
+    return statics[0], tuple(zip(fields, statics[1:]))
+
+
+_SEGMENTS = {key: _split_template(template) for key, template in _TEMPLATES.items()}
+
+
+def _render_bytes(key: str, **values) -> bytes:
+    """
+    Render a template to UTF-8 bytes, escaping and encoding only the field values.
+    Values such as usernames and auction names are user input, so all of them
+    are escaped; none of the fields carries markup of its own.
+    This is a few microseconds per email, an order of magnitude less than
+    handing it to a worker thread, so it always runs inline on the event loop.
+    """
+    head, segments = _SEGMENTS[key]
+    parts = [head]
+    append = parts.append
+    for field, static in segments:
+        append(html.escape(str(values[field])).encode())
+        append(static)
+    return b"".join(parts)
+
+
+# Header block for bodies that are already UTF-8 bytes; the message is sent
+# as-is with SMTP sendmail, skipping EmailMessage and its generator
+_RAW_HEADER_TMPL = (
+    b"From: %s\r\nTo: %s\r\nSubject: %s\r\nDate: %s\r\n"
+    b"MIME-Version: 1.0\r\nContent-Type: text/%s; charset=utf-8\r\n"
+    b"Content-Transfer-Encoding: 8bit\r\n\r\n"
+)
+_RE_LINE_BREAKS = re.compile(r"[\r\n]+")
+# Recipient syntax check, so a malformed address fails before taking a pooled connection
+_RE_ADDRESS = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def _encode_header(value: str) -> bytes:
+    """Encode a header value, RFC 2047-encoding it unless it is plain ASCII"""
+    # Line breaks in user-supplied text (e.g. auction names) would inject headers
+    value = _RE_LINE_BREAKS.sub(" ", value)
+    if value.isascii():
+        return value.encode()
+    return Header(value, "utf-8").encode(linesep="\r\n").encode()
+
+
+def _fits_8bit(text: str) -> bool:
+    """Whether every line is short enough to send without a transfer encoding"""
+    return max(map(len, text.splitlines()), default=0) <= 998
+
+
+# Idle pooled connections are pinged this often so the server keeps them open
+_SMTP_KEEPALIVE_INTERVAL = 60
+# A connection unused for longer than this is checked with NOOP before sending,
+# so a socket killed by a NAT or server idle timeout fails fast instead of
+# hanging for MAIL_TIMEOUT
+_SMTP_STALE_AFTER = 120
+_SMTP_NOOP_TIMEOUT = 7
+
+# Outbound queue: queued emails are sent by background workers, and transient
+# failures are retried after 2, 4, 8, ... seconds
+_QUEUE_MAX_SIZE = 10_000
+_QUEUE_MAX_ATTEMPTS = 5
+_QUEUE_RETRY_BASE_DELAY = 2
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Whether a failed send is worth retrying: connection trouble or a 4xx reply"""
+    if isinstance(exc, aiosmtplib.SMTPResponseException):
+        return 400 <= exc.code < 500
+    if isinstance(exc, aiosmtplib.SMTPRecipientsRefused):
+        return all(400 <= refused.code < 500 for refused in exc.recipients)
+    return isinstance(exc, (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPTimeoutError, OSError))
+
+
+class EmailTask(TypedDict, total=False):
+    """Keyword arguments of one EmailPort.send_raw_email call, for enqueue"""
+    subject: str
+    content: Union[str, bytes]
+    target_address: str
+    is_html: bool
+    from_name: str
+    from_address: str
+
+
+_SERVICE_NAME = "Auction System Email Service"
+
+
+@dataclass(slots=True, frozen=True)
+class SendResult:
+    """Outcome of one send_raw_email call"""
+    success: bool
+    message: str
+    recipient: str
+    sent_at: datetime
+    service: str = _SERVICE_NAME
+    error_type: Optional[str] = None
+
+
+@dataclass
+class PooledSMTP:
+    """An SMTP connection kept open between sends"""
+    client: aiosmtplib.SMTP
+    last_success: float = 0.0
+    msg_count: int = 0
 
 
 class EmailPort:
@@ -20,11 +485,221 @@ class EmailPort:
     """
     
     def __init__(self):
-        self.service_name = "Auction System Email Service"
+        self.service_name = _SERVICE_NAME
         self.default_from_name = mail_settings.MAIL_FROM_NAME
         self.default_from_address = mail_settings.MAIL_FROM_ADDRESS
+        # formataddr RFC 2047-encodes a non-ASCII name, so the header is plain ASCII
+        self._default_from_header = formataddr((self.default_from_name, self.default_from_address))
+        self._default_from_header_bytes = self._default_from_header.encode("ascii")
         self.support_email = mail_settings.SUPPORT_EMAIL
         
+        # Created on first send, since the queue and keepalive task need a running loop
+        self._pool: Optional[asyncio.Queue] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        # monotonic times of recent reconnects, for get_service_status()
+        self._reconnects = deque(maxlen=1000)
+        # Outbound queue of (task, attempt) and its workers, also created on first use
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+    
+    @staticmethod
+    def _new_connection() -> PooledSMTP:
+        """Create a pool slot; it connects and logs in on first use"""
+        return PooledSMTP(aiosmtplib.SMTP(
+            hostname=mail_settings.MAIL_HOST,
+            port=mail_settings.MAIL_PORT,
+            start_tls=mail_settings.MAIL_USE_TLS,
+            username=mail_settings.MAIL_USERNAME,
+            password=mail_settings.MAIL_PASSWORD,
+            timeout=mail_settings.MAIL_TIMEOUT
+        ))
+    
+    @staticmethod
+    async def _quit(client: aiosmtplib.SMTP):
+        """Say QUIT on a connection, dropping it if the server is already gone"""
+        try:
+            await client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            client.close()
+    
+    def _get_pool(self) -> asyncio.Queue:
+        if self._pool is None:
+            self._pool = asyncio.Queue()
+            for _ in range(mail_settings.MAIL_POOL_SIZE):
+                self._pool.put_nowait(self._new_connection())
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+        return self._pool
+    
+    async def _is_alive(self, pooled: PooledSMTP) -> bool:
+        """Check a connection with NOOP, bounded by a short timeout"""
+        try:
+            await asyncio.wait_for(pooled.client.noop(), timeout=_SMTP_NOOP_TIMEOUT)
+        except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError):
+            return False
+        pooled.last_success = time.monotonic()
+        return True
+    
+    async def _still_open(self, pooled: PooledSMTP) -> bool:
+        """Whether a used connection can take another message"""
+        if not pooled.client.is_connected:
+            return False
+        if time.monotonic() - pooled.last_success > _SMTP_STALE_AFTER:
+            return await self._is_alive(pooled)
+        return True
+    
+    async def _acquire(self) -> PooledSMTP:
+        """Take a connection from the pool, waiting if all are busy"""
+        pool = self._get_pool()
+        pooled = await pool.get()
+        try:
+            # last_success is only zero on a slot that has never connected
+            if pooled.last_success and not await self._still_open(pooled):
+                logger.warning("SMTP connection to %s was dropped, reconnecting", mail_settings.MAIL_HOST)
+                self._reconnects.append(time.monotonic())
+                pooled.client.close()
+                pooled = self._new_connection()
+            if not pooled.client.is_connected:
+                await pooled.client.connect()
+                pooled.last_success = time.monotonic()
+        except BaseException:
+            pooled.client.close()
+            pool.put_nowait(self._new_connection())
+            raise
+        return pooled
+    
+    async def _release(self, pooled: PooledSMTP):
+        """Return a connection after a successful send, recycling it once it has sent enough"""
+        pooled.last_success = time.monotonic()
+        pooled.msg_count += 1
+        if pooled.msg_count < mail_settings.MAIL_MAX_MESSAGES_PER_CONNECTION:
+            self._pool.put_nowait(pooled)
+            return
+        self._pool.put_nowait(self._new_connection())
+        await self._quit(pooled.client)
+    
+    def _discard(self, pooled: PooledSMTP):
+        """Drop a connection whose state is unknown after a failed send"""
+        pooled.client.close()
+        self._pool.put_nowait(self._new_connection())
+    
+    async def _keepalive(self):
+        """Send NOOP on idle connections so the server does not time them out"""
+        while True:
+            await asyncio.sleep(_SMTP_KEEPALIVE_INTERVAL)
+            for _ in range(self._pool.qsize()):
+                pooled = self._pool.get_nowait()
+                if pooled.client.is_connected and not await self._is_alive(pooled):
+                    pooled.client.close()
+                    pooled = self._new_connection()
+                self._pool.put_nowait(pooled)
+    
+    @staticmethod
+    async def _supports_8bitmime(client: aiosmtplib.SMTP) -> bool:
+        """Whether the server accepts 8-bit bodies, greeting it first if needed"""
+        if client.is_ehlo_or_helo_needed:
+            try:
+                await client.ehlo()
+            except aiosmtplib.SMTPHeloError:
+                await client.helo()
+        return client.supports_extension("8BITMIME")
+    
+    async def _send(self, sender: str, recipient: str, message: Union[bytes, EmailMessage]):
+        """Send one message on a pooled connection; bytes are sent as-is when the server supports 8BITMIME"""
+        # Reuse an open, authenticated connection instead of dialling per email.
+        # MAIL/RCPT/DATA are not pipelined even when the server offers
+        # PIPELINING: aiosmtplib's protocol keeps a single reply waiter and
+        # drops replies that arrive before the next one is awaited.
+        pooled = await self._acquire()
+        try:
+            # A connection stuck mid-send is dropped after MAIL_SEND_TIMEOUT,
+            # well before the longer MAIL_TIMEOUT meant for the handshake
+            if isinstance(message, bytes) and await self._supports_8bitmime(pooled.client):
+                send = pooled.client.sendmail(sender, [recipient], message, mail_options=["BODY=8BITMIME"])
+            else:
+                if isinstance(message, bytes):
+                    # Without 8BITMIME the body must be 7-bit; send_message
+                    # re-encodes the parsed message for the server
+                    message = message_from_bytes(message, policy=policy.default)
+                send = pooled.client.send_message(message)
+            await asyncio.wait_for(send, timeout=mail_settings.MAIL_SEND_TIMEOUT)
+        except BaseException:
+            self._discard(pooled)
+            raise
+        await self._release(pooled)
+    
+    def _get_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=_QUEUE_MAX_SIZE)
+            # One worker per pooled connection keeps every connection busy
+            self._workers = [asyncio.create_task(self._drain()) for _ in range(mail_settings.MAIL_POOL_SIZE)]
+        return self._queue
+    
+    def _requeue(self, task: EmailTask, attempt: int):
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait((task, attempt))
+        except asyncio.QueueFull:
+            logger.error("Email queue is full, dropped retry of email to %s", task["target_address"])
+    
+    async def _drain(self):
+        """Send queued emails, retrying transient SMTP failures with exponential backoff"""
+        while True:
+            task, attempt = await self._queue.get()
+            target_address = task["target_address"]
+            try:
+                sender, message = self._build_message(now=time.time(), **task)
+                await self._send(sender, target_address, message)
+            except Exception as e:
+                if _is_transient(e) and attempt + 1 < _QUEUE_MAX_ATTEMPTS:
+                    delay = _QUEUE_RETRY_BASE_DELAY * 2 ** attempt
+                    logger.warning("Failed to send email to %s: %s, retrying in %ss", target_address, e, delay)
+                    asyncio.get_running_loop().call_later(delay, self._requeue, task, attempt + 1)
+                else:
+                    logger.error("Failed to send email to %s: %s", target_address, e)
+            else:
+                logger.info("Email sent successfully to %s", target_address)
+    
+    def enqueue(self, task: EmailTask) -> SendResult:
+        """
+        Xếp email vào hàng đợi để gửi nền, trả về ngay không chờ SMTP
+        
+        Args:
+            task: Tham số của send_raw_email
+        
+        Returns:
+            SendResult: Kết quả xếp hàng (success=False nếu địa chỉ sai hoặc hàng đợi đầy)
+        """
+        target_address = task["target_address"]
+        queued_at = datetime.now(timezone.utc)
+        if not _RE_ADDRESS.fullmatch(target_address):
+            error_msg = f"Invalid recipient address: {target_address!r}"
+            return SendResult(False, error_msg, target_address, queued_at, error_type="ValueError")
+        try:
+            self._get_queue().put_nowait((task, 0))
+        except asyncio.QueueFull:
+            error_msg = f"Email queue is full, dropped email to {target_address}"
+            logger.error(error_msg)
+            return SendResult(False, error_msg, target_address, queued_at, error_type="QueueFull")
+        return SendResult(True, f"Email queued for delivery to {target_address}", target_address, queued_at)
+    
+    async def aclose(self):
+        """Stop the queue workers and close pooled SMTP connections (called on application shutdown)"""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        if self._queue is not None and not self._queue.empty():
+            logger.warning("Dropping %d queued emails on shutdown", self._queue.qsize())
+        self._queue = None
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        pool, self._pool = self._pool, None
+        while pool is not None and not pool.empty():
+            pooled = pool.get_nowait()
+            if pooled.client.is_connected:
+                await self._quit(pooled.client)
+        
     def get_service_status(self) -> dict:
         """
         Kiểm tra trạng thái dịch vụ email
@@ -35,74 +710,107 @@ class EmailPort:
             "smtp_host": mail_settings.MAIL_HOST,
             "smtp_port": mail_settings.MAIL_PORT,
             "tls_enabled": mail_settings.MAIL_USE_TLS,
-            "last_check": datetime.utcnow().isoformat()
+            "smtp_pool": self._pool_status(),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "last_check": datetime.now(timezone.utc)
+        }
+    
+    def _pool_status(self) -> dict:
+        """Pool health: connections in use and reconnects after stale sockets"""
+        idle = self._pool.qsize() if self._pool is not None else mail_settings.MAIL_POOL_SIZE
+        hour_ago = time.monotonic() - 3600
+        return {
+            "size": mail_settings.MAIL_POOL_SIZE,
+            "active_connections": mail_settings.MAIL_POOL_SIZE - idle,
+            "reconnects_last_hour": sum(1 for t in self._reconnects if t > hour_ago)
         }
     
     async def send_raw_email(
         self,
         subject: str,
-        content: str,
+        content: Union[str, bytes],
         target_address: str,
         is_html: bool = True,
         from_name: str = None,
         from_address: str = None
-    ) -> dict:
+    ) -> SendResult:
         """
         Gateway endpoint: Gửi email thô qua SMTP
         
         Args:
             subject: Tiêu đề email
-            content: Nội dung email (HTML hoặc text)
+            content: Nội dung email (HTML hoặc text; bytes là UTF-8 đã mã hóa sẵn)
             target_address: Địa chỉ người nhận
             is_html: Định dạng HTML hay text
             from_name: Tên người gửi (optional)
             from_address: Địa chỉ người gửi (optional)
         
         Returns:
-            dict: Kết quả gửi email với success status và message
+            SendResult: Kết quả gửi email với success status và message
         """
+        now = time.time()
+        sent_at = datetime.fromtimestamp(now, timezone.utc)
         try:
+            sender, message = self._build_message(subject, content, target_address, is_html, from_name, from_address, now)
+            await self._send(sender, target_address, message)
+            
+            logger.info("Email sent successfully to %s", target_address)
+            return SendResult(True, f"Email sent successfully to {target_address}", target_address, sent_at)
+            
+        except Exception as e:
+            error_msg = f"Failed to send email to {target_address}: {str(e)}"
+            logger.error(error_msg)
+            return SendResult(False, error_msg, target_address, sent_at, error_type=type(e).__name__)
+    
+    def _build_message(
+        self,
+        subject: str,
+        content: Union[str, bytes],
+        target_address: str,
+        is_html: bool = True,
+        from_name: str = None,
+        from_address: str = None,
+        now: float = None
+    ) -> Tuple[str, Union[bytes, EmailMessage]]:
+        """Build the message for send_raw_email's arguments; returns (envelope sender, message)"""
+        if not _RE_ADDRESS.fullmatch(target_address):
+            raise ValueError(f"Invalid recipient address: {target_address!r}")
+        
+        sender = from_address or self.default_from_address
+        if from_name is None and from_address is None:
+            from_header = self._default_from_header
+            from_header_bytes = self._default_from_header_bytes
+        else:
+            from_header = formataddr((from_name or self.default_from_name, sender))
+            from_header_bytes = from_header.encode("ascii")
+        
+        # HTML is sent as raw 8-bit bytes; EmailMessage is kept for plain text
+        # and for HTML whose lines are too long for 8-bit transfer (RFC 5322
+        # limits lines to 998 characters), which it re-encodes
+        if isinstance(content, str) and is_html and _fits_8bit(content):
+            content = content.encode()
+        
+        if isinstance(content, bytes):
+            message = _RAW_HEADER_TMPL % (
+                from_header_bytes,
+                _encode_header(target_address),
+                _encode_header(subject),
+                formatdate(now, localtime=True).encode(),
+                b"html" if is_html else b"plain"
+            ) + content
+        else:
             message = EmailMessage()
-            message["From"] = f"{from_name or self.default_from_name} <{from_address or self.default_from_address}>"
+            message["From"] = from_header
             message["To"] = target_address
             message["Subject"] = subject
-            message["Date"] = datetime.now()
+            message["Date"] = formatdate(now, localtime=True)
             
             if is_html:
                 message.set_content(content, subtype="html")
             else:
                 message.set_content(content)
-            
-            await aiosmtplib.send(
-                message,
-                hostname=mail_settings.MAIL_HOST,
-                port=mail_settings.MAIL_PORT,
-                start_tls=mail_settings.MAIL_USE_TLS,
-                username=mail_settings.MAIL_USERNAME,
-                password=mail_settings.MAIL_PASSWORD,
-                timeout=mail_settings.MAIL_TIMEOUT
-            )
-            
-            print(f"Email sent successfully to {target_address}")
-            return {
-                "success": True,
-                "message": f"Email sent successfully to {target_address}",
-                "recipient": target_address,
-                "sent_at": datetime.utcnow().isoformat(),
-                "service": self.service_name
-            }
-            
-        except Exception as e:
-            error_msg = f"Failed to send email to {target_address}: {str(e)}"
-            print(error_msg)
-            return {
-                "success": False,
-                "message": error_msg,
-                "recipient": target_address,
-                "error_type": type(e).__name__,
-                "sent_at": datetime.utcnow().isoformat(),
-                "service": self.service_name
-            }
+        
+        return sender, message
     
     async def send_otp_email(
         self,
@@ -110,7 +818,7 @@ class EmailPort:
         username: str,
         target_address: str,
         request_type: str = "registration"
-    ) -> dict:
+    ) -> SendResult:
         """
         Gateway endpoint: Gửi email OTP xác minh
         
@@ -121,7 +829,7 @@ class EmailPort:
             request_type: Loại yêu cầu (registration, password_reset, email_change)
         
         Returns:
-            dict: Kết quả gửi email
+            SendResult: Kết quả xếp email vào hàng đợi gửi
         """
         
         # Định nghĩa message dựa trên loại request
@@ -158,94 +866,14 @@ class EmailPort:
             purpose_msg = "Vui lòng sử dụng mã xác minh bên dưới:"
             warning_msg = "Mã này sẽ hết hạn sau 5 phút."
         
-        # Template HTML
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="vi">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{subject}</title>
-        </head>
-        <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f5f5f5;">
-            <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 20px 0;">
-                <tr>
-                    <td align="center">
-                        <table width="500" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;">
-                            <!-- Header -->
-                            <tr>
-                                <td style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center;">
-                                    <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: 300;">
-                                        Auction System
-                                    </h1>
-                                </td>
-                            </tr>
-                            
-                            <!-- Content -->
-                            <tr>
-                                <td style="padding: 40px 30px;">
-                                    <!-- Greeting -->
-                                    <p style="font-size: 18px; color: #333333; margin: 0 0 20px 0; line-height: 1.5;">
-                                        {greeting}
-                                    </p>
-                                    
-                                    <!-- Purpose Message -->
-                                    <p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
-                                        {purpose_msg}
-                                    </p>
-                                    
-                                    <!-- OTP Code Box -->
-                                    <div style="text-align: center; margin: 40px 0;">
-                                        <div style="display: inline-block; background-color: #f8f9fa; border: 2px solid #e9ecef; border-radius: 8px; padding: 20px; min-width: 200px;">
-                                            <p style="font-size: 14px; color: #6c757d; margin: 0 0 10px 0; font-weight: 500;">
-                                                Mã xác minh của bạn:
-                                            </p>
-                                            <h2 style="font-family: 'Courier New', monospace; font-size: 32px; color: #495057; margin: 0; letter-spacing: 8px; font-weight: bold;">
-                                                {otp}
-                                            </h2>
-                                        </div>
-                                    </div>
-                                    
-                                    <!-- Warning -->
-                                    <div style="background-color: #fff3cd; border: 1px solid #ffeaa7; border-radius: 6px; padding: 15px; margin: 30px 0;">
-                                        <p style="font-size: 14px; color: #856404; margin: 0; line-height: 1.5;">
-                                            <strong>Lưu ý quan trọng:</strong><br>
-                                            {warning_msg}<br>
-                                            <strong>KHÔNG chia sẻ mã này với bất kỳ ai, kể cả nhân viên hỗ trợ.</strong>
-                                        </p>
-                                    </div>
-                                    
-                                    <!-- Footer -->
-                                    <div style="border-top: 1px solid #e9ecef; padding-top: 20px; margin-top: 40px;">
-                                        <p style="font-size: 12px; color: #6c757d; margin: 0 0 10px 0; line-height: 1.4;">
-                                            Nếu bạn có bất kỳ câu hỏi nào, vui lòng liên hệ với đội ngũ hỗ trợ tại {self.support_email}
-                                        </p>
-                                        <p style="font-size: 12px; color: #6c757d; margin: 0; line-height: 1.4;">
-                                            Email này được gửi tự động, vui lòng không trả lời email này.
-                                        </p>
-                                    </div>
-                                </td>
-                            </tr>
-                            
-                            <!-- Footer Strip -->
-                            <tr>
-                                <td style="background-color: #f8f9fa; padding: 20px; text-align: center;">
-                                    <p style="font-size: 12px; color: #6c757d; margin: 0;">
-                                        © 2024 Auction System. Tất cả quyền được bảo lưu.
-                                    </p>
-                                </td>
-                            </tr>
-                        </table>
-                    </td>
-                </tr>
-            </table>
-        </body>
-        </html>
-        """
+        html_content = _render_bytes(
+            "otp", subject=subject, greeting=greeting, purpose_msg=purpose_msg,
+            otp=otp, warning_msg=warning_msg, support_email=self.support_email
+        )
         
-        return await self.send_raw_email(subject, html_content, target_address, is_html=True)
+        return self.enqueue({"subject": subject, "content": html_content, "target_address": target_address})
     
-    async def send_welcome_email(self, username: str, email: str) -> dict:
+    async def send_welcome_email(self, username: str, email: str) -> SendResult:
         """
         Gateway endpoint: Gửi email chào mừng sau khi đăng ký thành công
         
@@ -254,76 +882,14 @@ class EmailPort:
             email: Địa chỉ email
         
         Returns:
-            dict: Kết quả gửi email
+            SendResult: Kết quả xếp email vào hàng đợi gửi
         """
         
         subject = "Chào mừng đến với Auction System!"
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="vi">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{subject}</title>
-        </head>
-        <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f5f5f5;">
-            <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 20px 0;">
-                <tr>
-                    <td align="center">
-                        <table width="500" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;">
-                            <!-- Header -->
-                            <tr>
-                                <td style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center;">
-                                    <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: 300;">
-                                        Chào mừng đến với Auction System!
-                                    </h1>
-                                </td>
-                            </tr>
-                            
-                            <!-- Content -->
-                            <tr>
-                                <td style="padding: 40px 30px; text-align: center;">
-                                    <h2 style="font-size: 20px; color: #333333; margin: 0 0 20px 0;">
-                                        Xin chào {username}!
-                                    </h2>
-                                    
-                                    <p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
-                                        Cảm ơn bạn đã đăng ký tài khoản tại Auction System. 
-                                        Email của bạn đã được xác minh thành công và tài khoản đã được kích hoạt.
-                                    </p>
-                                    
-                                    <div style="background-color: #e3f2fd; border: 1px solid #2196f3; border-radius: 6px; padding: 20px; margin: 30px 0;">
-                                        <p style="font-size: 14px; color: #1565c0; margin: 0; line-height: 1.5;">
-                                            <strong>Bây giờ bạn có thể:</strong><br>
-                                            • Đăng nhập vào tài khoản<br>
-                                            • Tham gia đấu giá sản phẩm<br>
-                                            • Đặt giá thầu và giành chiến thắng<br>
-                                            • Quản lý thông tin cá nhân
-                                        </p>
-                                    </div>
-                                    
-                                    <p style="font-size: 14px; color: #666666; margin: 30px 0 20px 0; line-height: 1.6;">
-                                        Nếu bạn có bất kỳ câu hỏi nào, đừng ngần ngại liên hệ với chúng tôi.
-                                    </p>
-                                    
-                                    <div style="border-top: 1px solid #e9ecef; padding-top: 20px; margin-top: 30px;">
-                                        <p style="font-size: 12px; color: #6c757d; margin: 0;">
-                                            Trân trọng,<br>
-                                            Đội ngũ Auction System
-                                        </p>
-                                    </div>
-                                </td>
-                            </tr>
-                        </table>
-                    </td>
-                </tr>
-            </table>
-        </body>
-        </html>
-        """
+        html_content = _render_bytes("welcome", subject=subject, username=username)
         
-        return await self.send_raw_email(subject, html_content, email, is_html=True)
+        return self.enqueue({"subject": subject, "content": html_content, "target_address": email})
 
     async def send_payment_email(
         self,
@@ -334,7 +900,7 @@ class EmailPort:
         qr_url: str,
         expires_at: datetime,
         email_type: str = "deposit"
-    ) -> dict:
+    ) -> SendResult:
         """
         Gateway endpoint: Gửi email thanh toán (đặt cọc hoặc thanh toán cuối)
         
@@ -348,7 +914,7 @@ class EmailPort:
             email_type: Loại email ("deposit" hoặc "final_payment")
         
         Returns:
-            dict: Kết quả gửi email
+            SendResult: Kết quả xếp email vào hàng đợi gửi
         """
         
         if email_type == "deposit":
@@ -357,164 +923,36 @@ class EmailPort:
             return await self._send_final_payment_email(username, email, auction_name, amount, qr_url, expires_at)
     
     async def _send_deposit_email(self, username: str, email: str, auction_name: str, 
-                                deposit_amount: int, qr_url: str, expires_at: datetime) -> dict:
+                                deposit_amount: int, qr_url: str, expires_at: datetime) -> SendResult:
         """
         Gửi email đặt cọc
         """
         subject = f"Thanh toán đặt cọc tham gia đấu giá - {auction_name}"
-        remaining_minutes = int((expires_at - datetime.utcnow()).total_seconds() / 60)
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="vi">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{subject}</title>
-        </head>
-        <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f5f5f5;">
-            <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 20px 0;">
-                <tr>
-                    <td align="center">
-                        <table width="500" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;">
-                            <!-- Header -->
-                            <tr>
-                                <td style="background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%); padding: 30px; text-align: center;">
-                                    <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: 300;">
-                                        Thanh toán đặt cọc tham gia đấu giá
-                                    </h1>
-                                </td>
-                            </tr>
-                            
-                            <!-- Content -->
-                            <tr>
-                                <td style="padding: 40px 30px;">
-                                    <p style="font-size: 18px; color: #333333; margin: 0 0 20px 0; line-height: 1.5;">
-                                        Xin chào {username}!
-                                    </p>
-                                    
-                                    <div style="background-color: #f8f9fa; border: 1px solid #e9ecef; border-radius: 8px; padding: 20px; margin: 20px 0;">
-                                        <h3 style="font-size: 18px; color: #333333; margin: 0 0 15px 0;">
-                                            {auction_name}
-                                        </h3>
-                                        <p style="font-size: 16px; color: #495057; margin: 0; font-weight: bold;">
-                                            Số tiền đặt cọc: <span style="color: #dc3545;">{deposit_amount:,} VND</span>
-                                        </p>
-                                    </div>
-                                    
-                                    <p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
-                                        Để hoàn tất đăng ký tham gia đấu giá, vui lòng thực hiện thanh toán đặt cọc 
-                                        trong thời gian quy định.
-                                    </p>
-                                    
-                                    <div style="text-align: center; margin: 30px 0;">
-                                        <p style="font-size: 14px; color: #666666; margin: 20px 0;">
-                                            <a href="{qr_url}" style="color: #007bff; text-decoration: none;">Click vào đây để thanh toán trên web</a>
-                                        </p>
-                                    </div>
-                                    
-                                    <div style="background-color: #fff3cd; border: 1px solid #ffeaa7; border-radius: 6px; padding: 15px; margin: 30px 0;">
-                                        <p style="font-size: 14px; color: #856404; margin: 0; line-height: 1.5;">
-                                            <strong>⚠️ QUAN TRỌNG:</strong><br>
-                                            Mã thanh toán sẽ hết hạn sau <span style="font-weight: bold;">{remaining_minutes} phút</span>!
-                                        </p>
-                                    </div>
-                                    
-                                    <p style="font-size: 12px; color: #6c757d; margin: 0 0 10px 0; line-height: 1.4;">
-                                        Liên hệ hỗ trợ: {self.support_email}
-                                    </p>
-                                </td>
-                            </tr>
-                        </table>
-                    </td>
-                </tr>
-            </table>
-        </body>
-        </html>
-        """
+        remaining_minutes = (expires_at - datetime.utcnow()) // timedelta(minutes=1)
         
-        return await self.send_raw_email(subject, html_content, email, is_html=True)
+        html_content = _render_bytes(
+            "deposit", subject=subject, username=username, auction_name=auction_name,
+            amount=f"{deposit_amount:,}", qr_url=qr_url, remaining_minutes=remaining_minutes,
+            support_email=self.support_email
+        )
+        
+        return self.enqueue({"subject": subject, "content": html_content, "target_address": email})
     
     async def _send_final_payment_email(self, username: str, email: str, auction_name: str, 
-                                       final_amount: int, qr_url: str, expires_at: datetime) -> dict:
+                                       final_amount: int, qr_url: str, expires_at: datetime) -> SendResult:
         """
         Gửi email thanh toán cuối
         """
         subject = f"🎉 Chúc mừng! Bạn đã thắng đấu giá - {auction_name}"
-        remaining_hours = int((expires_at - datetime.utcnow()).total_seconds() / 3600)
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="vi">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{subject}</title>
-        </head>
-        <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f5f5f5;">
-            <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 20px 0;">
-                <tr>
-                    <td align="center">
-                        <table width="500" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;">
-                            <!-- Header -->
-                            <tr>
-                                <td style="background: linear-gradient(135deg, #28a745 0%, #20c997 100%); padding: 30px; text-align: center;">
-                                    <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: 300;">
-                                        🎉 Chúc mừng! Bạn đã thắng đấu giá
-                                    </h1>
-                                </td>
-                            </tr>
-                            
-                            <!-- Content -->
-                            <tr>
-                                <td style="padding: 40px 30px;">
-                                    <div style="background-color: #d4edda; border: 1px solid #c3e6cb; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
-                                        <h2 style="font-size: 24px; color: #155724; margin: 0 0 15px 0;">
-                                            Xin chúc mừng {username}!
-                                        </h2>
-                                    </div>
-                                    
-                                    <div style="background-color: #f8f9fa; border: 1px solid #e9ecef; border-radius: 8px; padding: 20px; margin: 20px 0;">
-                                        <h3 style="font-size: 18px; color: #333333; margin: 0 0 15px 0;">
-                                            {auction_name}
-                                        </h3>
-                                        <p style="font-size: 16px; color: #495057; margin: 0; font-weight: bold;">
-                                            Số tiền thanh toán: <span style="color: #28a745;">{final_amount:,} VND</span>
-                                        </p>
-                                    </div>
-                                    
-                                    <p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
-                                        Để hoàn tất giao dịch, vui lòng thực hiện thanh toán số tiền còn lại 
-                                        trong vòng 24 giờ.
-                                    </p>
-                                    
-                                    <div style="text-align: center; margin: 30px 0;">
-                                        <p style="font-size: 14px; color: #666666; margin: 20px 0;">
-                                            <a href="{qr_url}" style="color: #007bff; text-decoration: none;">Click vào đây để thanh toán trên web</a>
-                                        </p>
-                                    </div>
-                                    
-                                    <div style="background-color: #e3f2fd; border: 1px solid #2196f3; border-radius: 6px; padding: 15px; margin: 30px 0;">
-                                        <p style="font-size: 14px; color: #1565c0; margin: 0; line-height: 1.5;">
-                                            <strong>⏰ Thời hạn thanh toán:</strong><br>
-                                            Mã thanh toán có hiệu lực trong <span style="font-weight: bold;">{remaining_hours} giờ</span>.
-                                        </p>
-                                    </div>
-                                    
-                                    <p style="font-size: 12px; color: #6c757d; margin: 0 0 10px 0; line-height: 1.4;">
-                                        Liên hệ hỗ trợ: {self.support_email}
-                                    </p>
-                                </td>
-                            </tr>
-                        </table>
-                    </td>
-                </tr>
-            </table>
-        </body>
-        </html>
-        """
+        remaining_hours = (expires_at - datetime.utcnow()) // timedelta(hours=1)
         
-        return await self.send_raw_email(subject, html_content, email, is_html=True)
+        html_content = _render_bytes(
+            "final_payment", subject=subject, username=username, auction_name=auction_name,
+            amount=f"{final_amount:,}", qr_url=qr_url, remaining_hours=remaining_hours,
+            support_email=self.support_email
+        )
+        
+        return self.enqueue({"subject": subject, "content": html_content, "target_address": email})
     
     async def send_payment_confirmation_email(
         self,
@@ -524,7 +962,7 @@ class EmailPort:
         payment_amount: int,
         payment_type: str,
         payment_method: str = "bank_transfer"
-    ) -> dict:
+    ) -> SendResult:
         """
         Gateway endpoint: Gửi email xác nhận thanh toán thành công
         
@@ -537,7 +975,7 @@ class EmailPort:
             payment_method: Phương thức thanh toán
         
         Returns:
-            dict: Kết quả gửi email
+            SendResult: Kết quả xếp email vào hàng đợi gửi
         """
         
         if payment_type == "deposit":
@@ -549,122 +987,14 @@ class EmailPort:
             payment_type_text = "Thanh toán đấu giá"
             next_steps = "Chúng tôi sẽ liên hệ trong 24 giờ để sắp xếp việc giao hàng."
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="vi">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{subject}</title>
-        </head>
-        <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f5f5f5;">
-            <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 20px 0;">
-                <tr>
-                    <td align="center">
-                        <table width="500" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;">
-                            <!-- Header -->
-                            <tr>
-                                <td style="background: linear-gradient(135deg, #28a745 0%, #20c997 100%); padding: 30px; text-align: center;">
-                                    <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: 300;">
-                                        {subject}
-                                    </h1>
-                                </td>
-                            </tr>
-                            
-                            <!-- Content -->
-                            <tr>
-                                <td style="padding: 40px 30px; text-align: center;">
-                                    <div style="margin: 0 0 30px 0;">
-                                        <div style="width: 80px; height: 80px; background-color: #28a745; border-radius: 50%; display: inline-flex; align-items: center; justify-content: center; font-size: 40px; color: white;">
-                                            ✓
-                                        </div>
-                                    </div>
-                                    
-                                    <h2 style="font-size: 24px; color: #333333; margin: 0 0 20px 0;">
-                                        Xin chúc mừng {username}!
-                                    </h2>
-                                    
-                                    <p style="font-size: 16px; color: #666666; margin: 0 0 30px 0; line-height: 1.6;">
-                                        Chúng tôi đã nhận được thanh toán của bạn một cách thành công.
-                                    </p>
-                                    
-                                    <div style="background-color: #f8f9fa; border: 1px solid #e9ecef; border-radius: 8px; padding: 25px; margin: 30px 0; text-align: left;">
-                                        <h3 style="font-size: 18px; color: #333333; margin: 0 0 20px 0; text-align: center;">
-                                            Chi tiết thanh toán
-                                        </h3>
-                                        
-                                        <table style="width: 100%;">
-                                            <tr>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #6c757d; width: 40%;">
-                                                    Loại thanh toán:
-                                                </td>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #333333; font-weight: bold;">
-                                                    {payment_type_text}
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #6c757d;">
-                                                    Sản phẩm đấu giá:
-                                                </td>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #333333; font-weight: bold;">
-                                                    {auction_name}
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #6c757d;">
-                                                    Số tiền:
-                                                </td>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #28a745; font-weight: bold; font-size: 16px;">
-                                                    {payment_amount:,} VND
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #6c757d;">
-                                                    Phương thức thanh toán:
-                                                </td>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #333333;">
-                                                    {payment_method}
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #6c757d;">
-                                                    Thời gian thanh toán:
-                                                </td>
-                                                <td style="padding: 8px 0; font-size: 14px; color: #333333;">
-                                                    {datetime.utcnow().strftime('%d/%m/%Y %H:%M:%S UTC')}
-                                                </td>
-                                            </tr>
-                                        </table>
-                                    </div>
-                                    
-                                    <div style="background-color: #e3f2fd; border: 1px solid #2196f3; border-radius: 6px; padding: 20px; margin: 30px 0;">
-                                        <p style="font-size: 14px; color: #1565c0; margin: 0; line-height: 1.5;">
-                                            <strong>Bước tiếp theo:</strong><br>
-                                            {next_steps}
-                                        </p>
-                                    </div>
-                                    
-                                    <p style="font-size: 14px; color: #666666; margin: 30px 0 20px 0; line-height: 1.6;">
-                                        Cảm ơn bạn đã sử dụng dịch vụ của chúng tôi.
-                                    </p>
-                                    
-                                    <div style="border-top: 1px solid #e9ecef; padding-top: 20px; margin-top: 30px;">
-                                        <p style="font-size: 12px; color: #6c757d; margin: 0;">
-                                            Trân trọng,<br>
-                                            Đội ngũ Auction System
-                                        </p>
-                                    </div>
-                                </td>
-                            </tr>
-                        </table>
-                    </td>
-                </tr>
-            </table>
-        </body>
-        </html>
-        """
+        html_content = _render_bytes(
+            "payment_confirmation", subject=subject, username=username,
+            payment_type_text=payment_type_text, auction_name=auction_name,
+            amount=f"{payment_amount:,}", payment_method=payment_method,
+            paid_at=datetime.utcnow().strftime('%d/%m/%Y %H:%M:%S UTC'), next_steps=next_steps
+        )
         
-        return await self.send_raw_email(subject, html_content, email, is_html=True)
+        return self.enqueue({"subject": subject, "content": html_content, "target_address": email})
 
 
 # Khởi tạo instance global để sử dụng trong toàn bộ ứng dụng
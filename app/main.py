@@ -1,15 +1,20 @@
 from fastapi import FastAPI, Depends, HTTPException, WebSocket, Request, Response
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 import logging
-from datetime import datetime
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from functools import lru_cache
 import os
+import time
+from typing import Optional
+import orjson
 
-from . import crud, models, schemas
-from .database import SessionLocal, engine
+from . import crud, schemas
+from .database import engine, async_engine, ensure_database_exists, ensure_tables_exist
+from .email_port import email_port
+from .middleware import FastCORSMiddleware, FastTrustedHostMiddleware
 from .routers import auth, accounts, products, auctions, search, participation, bids, payments, status, websocket, sse, notifications, bank, images
 from .config import settings
 
@@ -18,6 +23,42 @@ from .config import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# While the app runs, records are handed to a queue and written by a
+# background thread, so logging from a coroutine never blocks the event loop on stdout
+_log_queue = queue.SimpleQueue()
+_log_listener: Optional[QueueListener] = None
+
+
+def _start_log_listener():
+    """Move the root handlers behind the queue and start the thread writing to them"""
+    global _log_listener
+    _log_listener = QueueListener(_log_queue, *logging.root.handlers, respect_handler_level=True)
+    logging.root.handlers = [QueueHandler(_log_queue)]
+    _log_listener.start()
+
+
+def _stop_log_listener():
+    """Flush queued records and give the root logger its handlers back"""
+    global _log_listener
+    if _log_listener is None:
+        return
+    _log_listener.stop()
+    logging.root.handlers = list(_log_listener.handlers)
+    _log_listener = None
+
+
+@lru_cache(maxsize=1)
+def _iso_second(sec: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in ISO format; the part up to the second is formatted at most once per second"""
+    now = time.time()
+    sec = int(now)
+    return f"{_iso_second(sec)}.{int((now - sec) * 1_000_000):06d}"
+
+
 app = FastAPI(
     title="Auction Backend API",
     description="Backend for online auction platform with email verification, OTP authentication, and comprehensive functionality",
@@ -26,26 +67,22 @@ app = FastAPI(
         "name": "Auction API Support",
         "email": "support@auction.com",
     },
+    # Responses are encoded with orjson rather than the stdlib json module
+    default_response_class=ORJSONResponse,
 )
 
 # Trusted Host middleware for security
 app.add_middleware(
-    TrustedHostMiddleware, 
+    FastTrustedHostMiddleware, 
     allowed_hosts=["localhost", "127.0.0.1", "*.localhost", "*.example.com"]
 )
 
 # CORS middleware for frontend integration
-allowed_origins = [
-    "http://localhost:3000",    # React dev server
-    "http://localhost:5173",    # Vite dev server
-    "http://127.0.0.1:3000",
-    "http://127.0.0.1:5173"
-    # Note: Never use "*" when allow_credentials=True
-]
-
+# Origins come from ALLOWED_ORIGINS (comma-separated).
+# Note: Never use "*" when allow_credentials=True
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
+    FastCORSMiddleware,
+    allow_origins=list(settings.allowed_origins_list),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=[
@@ -57,6 +94,7 @@ app.add_middleware(
         "Access-Control-Request-Method",
         "Access-Control-Request-Headers"
     ],
+    expose_headers=["X-Next-Cursor"],  # next page cursor on list endpoints
 )
 
 # Static file serving for uploaded images
@@ -73,12 +111,12 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Custom HTTP exception handler"""
     logger.warning(f"HTTPException: {exc.status_code} - {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
             "detail": exc.detail,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_timestamp()
         }
     )
 
@@ -87,13 +125,13 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def validation_exception_handler(request: Request, exc):
     """Handle validation errors"""
     logger.warning(f"Validation error: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "success": False,
             "detail": "Validation failed",
             "errors": exc.errors(),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_timestamp()
         }
     )
 
@@ -108,13 +146,13 @@ async def general_exception_handler(request: Request, exc):
     logger.error(f"Unexpected error: {error_detail}")
     logger.error(f"Traceback: {traceback_str}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
             "detail": error_detail if "UnicodeEncodeError" in error_detail else "Internal server error",
             "traceback": traceback_str if "UnicodeEncodeError" in error_detail else None,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_timestamp()
         }
     )
 
@@ -139,9 +177,14 @@ app.include_router(images.router)
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup"""
-    # Create database tables
-    models.Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully")
+    _start_log_listener()
+    
+    # Create the database itself (MySQL), then its tables
+    ensure_database_exists()
+    ensure_tables_exist()
+    print("Database tables ready")
+    if engine.dialect.name == "mysql" and not crud.detect_fulltext_search():
+        print("Warning: auction name FULLTEXT index missing, searching with LIKE (see migrations/auction_name_fulltext.sql)")
 
 
 @app.on_event("shutdown")
@@ -150,121 +193,137 @@ async def shutdown_event():
     # Clean up WebSocket connections
     crud.active_connections.clear()
     print("WebSocket connections cleaned up")
+    
+    # Close pooled async connections so their driver threads exit
+    await async_engine.dispose()
+    await email_port.aclose()
+    
+    # Flush queued log records and restore the direct handlers
+    _stop_log_listener()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@app.get("/")
-def root():
-    """Root endpoint with API information"""
-    return {
-        "message": "Auction Backend API v2.0",
-        "version": "2.0.0",
-        "description": "Comprehensive auction platform backend with email verification, OTP authentication, password recovery, and real-time notifications",
-        "status": "operational",
-        "timestamp": datetime.utcnow().isoformat(),
-        "new_features_v2": {
-            "email_verification": "OTP-based email verification during registration",
-            "password_recovery": "OTP-based password recovery system",
-            "otp_management": "Secure OTP tokens stored in client localStorage",
-            "rate_limiting": "Rate limiting disabled for testing (login only)",
-            "enhanced_security": "Password strength validation and input sanitization"
-        },
-        "endpoints": {
-            "Authentication": {
-                "base": "/auth",
-                "endpoints": [
-                    "POST /auth/register - Register with OTP email verification",
-                    "POST /auth/register/verify - Verify OTP for registration", 
-                    "POST /auth/register/resend - Resend OTP for registration",
-                    "POST /auth/login - User login",
-                    "POST /auth/refresh - Refresh access token",
-                    "POST /auth/recover - Request password recovery OTP",
-                    "POST /auth/recover/verify - Verify recovery OTP",
-                    "POST /auth/reset - Reset password with reset token",
-                    "POST /auth/logout - User logout",
-                    "GET /auth/me - Get current user info",
-                    "GET /auth/otp/status - Get OTP token status"
-                ]
-            },
-            "Account Management": "/accounts/*",
-            "Product Management": "/products/*", 
-            "Auction Management": "/auctions/*",
-            "Search & Filter": "/search/*",
-            "Participation": "/participation/*",
-            "Bidding": "/bids/*",
-            "Payments": "/payments/*",
-            "Image Management": "/images/*",
-            "Mock Bank API": "/bank/*",
-            "Status Management": "/status/*",
-            "WebSocket": "/ws/*",
-            "Server-Sent Events": "/sse/*",
-            "Notifications": "/notifications/*"
-        },
-        "authentication_flow": {
-            "registration": [
-                "1. POST /auth/register - Create account, send OTP email",
-                "2. Store otp_token in localStorage",
-                "3. POST /auth/register/verify - Verify OTP code",
-                "4. Account activated, tokens returned for auto-login"
-            ],
-            "password_recovery": [
-                "1. POST /auth/recover - Request OTP for password recovery",
-                "2. Store otp_token in localStorage", 
-                "3. POST /auth/recover/verify - Verify OTP, receive reset_token",
-                "4. POST /auth/reset - Use reset_token to set new password"
+# The API overview served by / is encoded once; each response only splices
+# in the current timestamp
+_TIMESTAMP_SLOT = "__timestamp__"
+_ROOT_DOC = {
+    "message": "Auction Backend API v2.0",
+    "version": "2.0.0",
+    "description": "Comprehensive auction platform backend with email verification, OTP authentication, password recovery, and real-time notifications",
+    "status": "operational",
+    "timestamp": _TIMESTAMP_SLOT,
+    "new_features_v2": {
+        "email_verification": "OTP-based email verification during registration",
+        "password_recovery": "OTP-based password recovery system",
+        "otp_management": "Secure OTP tokens stored in client localStorage",
+        "rate_limiting": "Rate limiting disabled for testing (login only)",
+        "enhanced_security": "Password strength validation and input sanitization"
+    },
+    "endpoints": {
+        "Authentication": {
+            "base": "/auth",
+            "endpoints": [
+                "POST /auth/register - Register with OTP email verification",
+                "POST /auth/register/verify - Verify OTP for registration", 
+                "POST /auth/register/resend - Resend OTP for registration",
+                "POST /auth/login - User login",
+                "POST /auth/refresh - Refresh access token",
+                "POST /auth/recover - Request password recovery OTP",
+                "POST /auth/recover/verify - Verify recovery OTP",
+                "POST /auth/reset - Reset password with reset token",
+                "POST /auth/logout - User logout",
+                "GET /auth/me - Get current user info",
+                "GET /auth/otp/status - Get OTP token status"
             ]
         },
-        "security_features": {
-            "rate_limiting": {
-                "registration": "No rate limiting (removed)",
-                "login": "Rate limiting disabled (removed)",
-                "otp_resend": "3 requests/15min per IP",
-                "password_recovery": "3 requests/15min per IP"
-            },
-            "password_requirements": {
-                "min_length": "8 characters",
-                "required": ["uppercase", "lowercase", "number", "special character"]
-            },
-            "otp_settings": {
-                "length": "6 digits",
-                "expiry": "5 minutes",
-                "max_trials": 5
-            }
+        "Account Management": "/accounts/*",
+        "Product Management": "/products/*", 
+        "Auction Management": "/auctions/*",
+        "Search & Filter": "/search/*",
+        "Participation": "/participation/*",
+        "Bidding": "/bids/*",
+        "Payments": "/payments/*",
+        "Image Management": "/images/*",
+        "Mock Bank API": "/bank/*",
+        "Status Management": "/status/*",
+        "WebSocket": "/ws/*",
+        "Server-Sent Events": "/sse/*",
+        "Notifications": "/notifications/*"
+    },
+    "authentication_flow": {
+        "registration": [
+            "1. POST /auth/register - Create account, send OTP email",
+            "2. Store otp_token in localStorage",
+            "3. POST /auth/register/verify - Verify OTP code",
+            "4. Account activated, tokens returned for auto-login"
+        ],
+        "password_recovery": [
+            "1. POST /auth/recover - Request OTP for password recovery",
+            "2. Store otp_token in localStorage", 
+            "3. POST /auth/recover/verify - Verify OTP, receive reset_token",
+            "4. POST /auth/reset - Use reset_token to set new password"
+        ]
+    },
+    "security_features": {
+        "rate_limiting": {
+            "registration": "No rate limiting (removed)",
+            "login": "Rate limiting disabled (removed)",
+            "otp_resend": "3 requests/15min per IP",
+            "password_recovery": "3 requests/15min per IP"
         },
-        "real_time_features": {
-            "WebSocket": {
-                "notifications": "ws://localhost:8000/ws/notifications/{access_token}",
-                "auction_updates": "ws://localhost:8000/ws/auction/{auction_id}/{access_token}"
-            },
-            "SSE": {
-                "notifications": "GET /sse/notifications (with Authorization header)",
-                "auction_updates": "GET /sse/auction/{auction_id} (with Authorization header)",
-                "test": "GET /sse/test (with Authorization header)"
-            },
-            "notification_types": [
-                "bid_outbid - When user is outbid",
-                "bid_placed - Confirmation of bid placement",
-                "auction_ending - Warning before auction ends",
-                "auction_won - When user wins an auction",
-                "payment_required - When payment is needed"
-            ]
+        "password_requirements": {
+            "min_length": "8 characters",
+            "required": ["uppercase", "lowercase", "number", "special character"]
         },
-        "email_templates": {
-            "otp_verification": "Beautiful HTML email with OTP code",
-            "welcome_email": "Welcome message after successful registration",
-            "responsive_design": "Mobile-friendly email templates"
+        "otp_settings": {
+            "length": "6 digits",
+            "expiry": "5 minutes",
+            "max_trials": 5
+        }
+    },
+    "real_time_features": {
+        "WebSocket": {
+            "notifications": "ws://localhost:8000/ws/notifications/{access_token}",
+            "auction_updates": "ws://localhost:8000/ws/auction/{auction_id}/{access_token}"
         },
-        "docs": "/docs",
-        "openapi_spec": "/openapi.json",
-        "health_check": "/health"
-    }
+        "SSE": {
+            "notifications": "GET /sse/notifications (with Authorization header)",
+            "auction_updates": "GET /sse/auction/{auction_id} (with Authorization header)",
+            "test": "GET /sse/test (with Authorization header)"
+        },
+        "notification_types": [
+            "bid_outbid - When user is outbid",
+            "bid_placed - Confirmation of bid placement",
+            "auction_ending - Warning before auction ends",
+            "auction_won - When user wins an auction",
+            "payment_required - When payment is needed"
+        ]
+    },
+    "email_templates": {
+        "otp_verification": "Beautiful HTML email with OTP code",
+        "welcome_email": "Welcome message after successful registration",
+        "responsive_design": "Mobile-friendly email templates"
+    },
+    "docs": "/docs",
+    "openapi_spec": "/openapi.json",
+    "health_check": "/health"
+}
+_ROOT_HEAD, _ROOT_TAIL = orjson.dumps(_ROOT_DOC).split(orjson.dumps(_TIMESTAMP_SLOT))
+
+
+@app.get("/")
+def root():
+    """Root endpoint with API information"""
+    body = b"".join((_ROOT_HEAD, b'"', _utc_timestamp().encode(), b'"', _ROOT_TAIL))
+    return Response(content=body, media_type="application/json")
+
+
+# Only the timestamp of the health response changes between calls
+_HEALTH_SERVICES = {
+    "database": "connected",
+    "email_service": "configured",
+    "otp_service": "active",
+    "rate_limiting": "disabled (login only)"
+}
 
 
 @app.get("/health")
@@ -272,14 +331,15 @@ def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _utc_timestamp(),
         "version": "2.0.0",
-        "services": {
-            "database": "connected",
-            "email_service": "configured",
-            "otp_service": "active",
-            "rate_limiting": "disabled (login only)"
-        }
+        "services": _HEALTH_SERVICES
     }
 
 
+@app.get("/health/email")
+def email_health_check():
+    """Email service status: SMTP pool usage, reconnects and queued emails"""
+    return email_port.get_service_status()
+
+
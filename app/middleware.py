@@ -0,0 +1,46 @@
+"""
+HTTP middleware used by the application
+"""
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.trustedhost import TrustedHostMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+class FastTrustedHostMiddleware(TrustedHostMiddleware):
+    """
+    TrustedHostMiddleware with the allowed hosts split once into a set of exact
+    hosts and a tuple of wildcard suffixes, so an allowed host is accepted with
+    one set lookup and one str.endswith() call. Rejected hosts fall through to
+    Starlette's implementation for the www redirect and the 400 response.
+    """
+
+    def __init__(self, app, allowed_hosts=None, www_redirect: bool = True) -> None:
+        super().__init__(app, allowed_hosts, www_redirect)
+        self._exact_hosts = frozenset(host for host in self.allowed_hosts if not host.startswith("*"))
+        self._wildcard_suffixes = tuple(host[1:] for host in self.allowed_hosts if host.startswith("*."))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.allow_any and scope["type"] in ("http", "websocket"):
+            for name, value in scope["headers"]:
+                if name == b"host":
+                    host = value.decode("latin-1").split(":")[0]
+                    if host in self._exact_hosts or host.endswith(self._wildcard_suffixes):
+                        await self.app(scope, receive, send)
+                        return
+                    break
+        await super().__call__(scope, receive, send)
+
+
+class FastCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware with the allowed origins, methods and lowercased headers
+    held in frozensets. Starlette already joins the preflight response headers
+    once at startup but keeps these as lists, which every request and
+    preflight scans.
+    """
+
+    def __init__(self, app, **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self.allow_origins = frozenset(self.allow_origins)
+        self.allow_methods = frozenset(self.allow_methods)
+        self.allow_headers = frozenset(self.allow_headers)
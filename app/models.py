@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum as SqlEnum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, Enum as SqlEnum, func
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime, date
 from typing import Optional, List
@@ -17,6 +17,19 @@ class AccountStatus(str, Enum):
     INACTIVE = "inactive"
     SUSPENDED = "suspended"
 
+class BidStatus(str, Enum):
+    ACTIVE = "active"
+    CANCELLED = "cancelled"
+
+class PaymentType(str, Enum):
+    DEPOSIT = "deposit"
+    FINAL_PAYMENT = "final_payment"
+
+
+def _enum_values(enum_cls) -> List[str]:
+    # Stored as the lowercase values already in these columns, not member names
+    return [member.value for member in enum_cls]
+
 
 # ------------------ ACCOUNT ------------------ #
 class Account(Base):
@@ -35,7 +48,7 @@ class Account(Base):
     status: Mapped[AccountStatus] = mapped_column(SqlEnum(AccountStatus), nullable=False, default=AccountStatus.ACTIVE)
     lastLoginAt: Mapped[Optional[datetime]] = mapped_column(DateTime)
     isAuthenticated: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
-    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
 
     bids: Mapped[List["Bid"]] = relationship(back_populates="user", cascade="all, delete-orphan")
     payments: Mapped[List["Payment"]] = relationship(back_populates="user", cascade="all, delete-orphan")
@@ -64,8 +77,8 @@ class Product(Base):
     approvalStatus: Mapped[Optional[str]] = mapped_column(String(50), default="pending")  # pending, approved, rejected
     rejectionReason: Mapped[Optional[str]] = mapped_column(String(1024))
     suggestedByUserID: Mapped[Optional[int]] = mapped_column(ForeignKey("account.accountID"))
-    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    updatedAt: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=func.now())
 
     auctions: Mapped[List["Auction"]] = relationship(back_populates="product")
     suggestedBy: Mapped[Optional["Account"]] = relationship(
@@ -76,17 +89,23 @@ class Product(Base):
 # ------------------ AUCTION ------------------ #
 class Auction(Base):
     __tablename__ = "auction"
+    # Name search goes through a FULLTEXT index (a plain index elsewhere, as
+    # mysql_prefix is MySQL-only); status + price step filters share one range
+    __table_args__ = (
+        Index("ix_auction_name_ft", "auctionName", mysql_prefix="FULLTEXT"),
+        Index("ix_auction_status_price_step", "auctionStatus", "priceStep"),
+    )
 
     auctionID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     auctionName: Mapped[str] = mapped_column(String(256), nullable=False)
-    productID: Mapped[int] = mapped_column(ForeignKey("product.productID"), nullable=False)
-    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    productID: Mapped[int] = mapped_column(ForeignKey("product.productID"), nullable=False, index=True)
+    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    updatedAt: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=func.now())
     startDate: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     endDate: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     priceStep: Mapped[int] = mapped_column(Integer, nullable=False)
     auctionStatus: Mapped[Optional[str]] = mapped_column(String(100))
-    bidWinnerID: Mapped[Optional[int]] = mapped_column(ForeignKey("account.accountID"))
+    bidWinnerID: Mapped[Optional[int]] = mapped_column(ForeignKey("account.accountID"), index=True)
 
     product: Mapped["Product"] = relationship(back_populates="auctions")
     bids: Mapped[List["Bid"]] = relationship(back_populates="auction", cascade="all, delete-orphan")
@@ -97,13 +116,19 @@ class Auction(Base):
 # ------------------ BID ------------------ #
 class Bid(Base):
     __tablename__ = "bid"
+    # Bids of an auction are read ordered by price, and the highest active bid
+    # is a LIMIT 1 on the same order; both indexes also cover the auctionID FK
+    __table_args__ = (
+        Index("ix_bid_auction_price", "auctionID", "bidPrice"),
+        Index("ix_bid_auction_status_price", "auctionID", "bidStatus", "bidPrice"),
+    )
 
     bidID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    auctionID: Mapped[int] = mapped_column(ForeignKey("auction.auctionID"), nullable=False, index=True)
+    auctionID: Mapped[int] = mapped_column(ForeignKey("auction.auctionID"), nullable=False)
     userID: Mapped[int] = mapped_column(ForeignKey("account.accountID"), nullable=False, index=True)
     bidPrice: Mapped[int] = mapped_column(Integer, nullable=False)
-    bidStatus: Mapped[Optional[str]] = mapped_column(String(100))
-    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    bidStatus: Mapped[Optional[BidStatus]] = mapped_column(SqlEnum(BidStatus, values_callable=_enum_values))
+    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
 
     auction: Mapped["Auction"] = relationship(back_populates="bids")
     user: Mapped["Account"] = relationship(back_populates="bids")
@@ -113,9 +138,16 @@ class Bid(Base):
 
 class Payment(Base):
     __tablename__ = "payment"
+    # A user's deposit for an auction is looked up by (auctionID, userID,
+    # paymentType); the index also serves per-auction listings and covers the
+    # auctionID FK. Account checks filter a user's payments by status.
+    __table_args__ = (
+        Index("ix_payment_auction_user_type", "auctionID", "userID", "paymentType"),
+        Index("ix_payment_user_status", "userID", "paymentStatus"),
+    )
 
     paymentID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    auctionID: Mapped[int] = mapped_column(ForeignKey("auction.auctionID"), nullable=False, index=True)
+    auctionID: Mapped[int] = mapped_column(ForeignKey("auction.auctionID"), nullable=False)
     userID: Mapped[int] = mapped_column(ForeignKey("account.accountID"), nullable=False, index=True)
 
     # Replaced user_fullname:
@@ -125,12 +157,15 @@ class Payment(Base):
     userAddress: Mapped[Optional[str]] = mapped_column(String(256))
     userReceivingOption: Mapped[Optional[str]] = mapped_column(String(256))
     userPaymentMethod: Mapped[Optional[str]] = mapped_column(String(100))
-    paymentStatus: Mapped[Optional[str]] = mapped_column(String(100))
+    # Short status codes; sized to them so the status indexes stay narrow
+    paymentStatus: Mapped[Optional[str]] = mapped_column(String(20))
     
     # NEW FIELDS FOR QR PAYMENT SYSTEM:
-    paymentType: Mapped[str] = mapped_column(String(50), nullable=False, default="final_payment")  # "deposit" or "final_payment"
+    paymentType: Mapped[PaymentType] = mapped_column(
+        SqlEnum(PaymentType, values_callable=_enum_values), nullable=False, default=PaymentType.FINAL_PAYMENT
+    )
     amount: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # Payment amount in VND
-    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
 
     auction: Mapped["Auction"] = relationship(back_populates="payments")
     user: Mapped["Account"] = relationship(back_populates="payments")
@@ -141,16 +176,20 @@ class Payment(Base):
 
 class PaymentToken(Base):
     __tablename__ = "payment_token"
+    # Tokens are read as the unused ones of a payment; covers the paymentID FK
+    __table_args__ = (
+        Index("ix_payment_token_payment_used", "paymentID", "isUsed"),
+    )
 
     tokenID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     token: Mapped[str] = mapped_column(String(512), unique=True, nullable=False, index=True)
-    paymentID: Mapped[int] = mapped_column(ForeignKey("payment.paymentID"), nullable=False, index=True)
+    paymentID: Mapped[int] = mapped_column(ForeignKey("payment.paymentID"), nullable=False)
     userID: Mapped[int] = mapped_column(ForeignKey("account.accountID"), nullable=False)
     amount: Mapped[int] = mapped_column(Integer, nullable=False)  # Amount in VND
     expiresAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     isUsed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     usedAt: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
 
     payment: Mapped["Payment"] = relationship(back_populates="tokens")
     user: Mapped["Account"] = relationship()
@@ -159,9 +198,17 @@ class PaymentToken(Base):
 # ------------------ NOTIFICATION ------------------ #
 class Notification(Base):
     __tablename__ = "notification"
+    # Unread counts filter on (userID, isRead); MySQL has no partial indexes,
+    # so a composite index lets the count be answered from the index alone.
+    # Listings read a user's notifications newest first; InnoDB appends the
+    # primary key, so both indexes end in (createdAt, notificationID).
+    __table_args__ = (
+        Index("ix_notification_user_unread", "userID", "isRead", "createdAt"),
+        Index("ix_notification_user_created", "userID", "createdAt"),
+    )
 
     notificationID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    userID: Mapped[int] = mapped_column(ForeignKey("account.accountID"), nullable=False, index=True)
+    userID: Mapped[int] = mapped_column(ForeignKey("account.accountID"), nullable=False)
     auctionID: Mapped[int] = mapped_column(ForeignKey("auction.auctionID"), nullable=False, index=True)
     
     notificationType: Mapped[str] = mapped_column(String(50), nullable=False)  # bid_outbid, auction_won, auction_lost, auction_ending, etc.
@@ -171,7 +218,7 @@ class Notification(Base):
     isRead: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     isSent: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     
-    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     readAt: Mapped[Optional[datetime]] = mapped_column(DateTime)
     
     user: Mapped["Account"] = relationship()
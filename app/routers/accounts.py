@@ -6,21 +6,12 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/register", response_model=schemas.UserResponse)
 def create_account(account: schemas.AccountCreate, db: Session = Depends(get_db)):
     """
@@ -39,9 +30,7 @@ def create_account(account: schemas.AccountCreate, db: Session = Depends(get_db)
         )
     
     # Check if email already exists
-    existing_email = db.query(crud.models.Account).filter(
-        crud.models.Account.email == account.email
-    ).first()
+    existing_email = crud.get_account_by_email(db, account.email)
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
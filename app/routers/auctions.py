@@ -1,26 +1,19 @@
 """
 Auction management endpoints (UC05 - Register auction, UC08 - View auction details, UC11 - Delete auction)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Optional
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
+from ..utils.pagination import get_cursor, set_next_cursor
 
 router = APIRouter(prefix="/auctions", tags=["Auctions"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/register", response_model=schemas.Auction)
 def register_auction(
     auction: schemas.AuctionCreate,
@@ -75,14 +68,21 @@ def register_auction(
 
 
 @router.get("/", response_model=list[schemas.Auction])
-def get_auctions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_auctions(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[schemas.Cursor] = Depends(get_cursor),
+    db: Session = Depends(get_db)
+):
     """
     Get all auctions
     
-    GET /auctions?skip=0&limit=100
-    Returns: List of auctions
+    GET /auctions?limit=100&cursor=<X-Next-Cursor>
+    Returns: List of auctions; X-Next-Cursor header holds the next page's cursor
     """
-    auctions = crud.get_auctions(db=db, skip=skip, limit=limit)
+    auctions = crud.get_auctions(db=db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, auctions, limit, "auctionID")
     return auctions
 
 
@@ -291,8 +291,5 @@ def get_registered_auctions(
             detail="Admin access required"
         )
     
-    # Get all auctions and filter by status
-    all_auctions = crud.get_auctions(db=db, skip=0, limit=1000)
-    registered_auctions = [a for a in all_auctions if a.auction_status == "registered" or a.auction_status == "pending"]
-    
-    return registered_auctions
\ No newline at end of file
+    # Get auctions waiting for registration
+    return crud.get_auctions_by_status(db=db, statuses=["registered", "pending"])
\ No newline at end of file
@@ -2,6 +2,7 @@
 Authentication endpoints: login, refresh, me, OTP verification, password recovery
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
@@ -9,8 +10,8 @@ from datetime import timedelta, datetime
 import asyncio
 
 from .. import crud, schemas
-from ..database import SessionLocal
-from ..models import Payment, Bid, Account
+from ..database import get_db
+from ..models import Payment, Bid
 from ..auth import (
     create_access_token,
     create_refresh_token,
@@ -22,8 +23,7 @@ from ..auth import (
     validate_password_strength,
     validate_email_format,
     validate_username_format,
-    get_password_hash,
-    verify_password,
+    aget_password_hash,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
 from ..utils.mailer import send_otp_email, send_welcome_email
@@ -34,15 +34,6 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer()
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -65,7 +56,7 @@ def get_current_user(
             detail="Invalid token payload",
         )
     
-    user = crud.get_account_by_username(db, username)
+    user = crud.get_account_snapshot(db, username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -272,7 +263,7 @@ async def register_with_otp(
     UNVERIFIED_ACCOUNT_EXPIRY_MINUTES = 15
     
     try:
-        db_account = crud.create_account(db=db, account=account_data)
+        db_account = await run_in_threadpool(crud.create_account, db, account_data)
     except IntegrityError as e:
         db.rollback()
         
@@ -280,13 +271,9 @@ async def register_with_otp(
         error_msg = str(e.orig).lower() if e.orig else str(e).lower()
         
         # Check for existing unverified account that can be wiped
-        existing_by_username = db.query(Account).filter(
-            Account.username == account_data.username
-        ).first()
+        existing_by_username = crud.get_account_by_username(db, account_data.username)
         
-        existing_by_email = db.query(Account).filter(
-            Account.email == account_data.email
-        ).first()
+        existing_by_email = crud.get_account_by_email(db, account_data.email)
         
         # Determine which account to potentially wipe
         existing_account = existing_by_username or existing_by_email
@@ -300,10 +287,11 @@ async def register_with_otp(
                 # Wipe the old unverified account
                 db.delete(existing_account)
                 db.commit()
+                crud.invalidate_account_cache(existing_account.accountID, existing_account.username)
                 
                 # Retry creating the new account
                 try:
-                    db_account = crud.create_account(db=db, account=account_data)
+                    db_account = await run_in_threadpool(crud.create_account, db, account_data)
                 except IntegrityError:
                     db.rollback()
                     # If still fails, there might be another conflict
@@ -388,6 +376,7 @@ async def verify_registration_otp(
         if user:
             user.isAuthenticated = True
             db.commit()
+            crud.invalidate_account_cache(user.accountID, user.username)
             
             # Send welcome email
             await send_welcome_email(user.username, user.email)
@@ -449,24 +438,24 @@ async def cancel_registration(
     # Note: In production, you might want to restrict deletion based on business rules
     
     # Check if user has any active participation in auctions
-    active_participations = db.query(Payment).filter(
+    has_participation = db.query(Payment.paymentID).filter(
         Payment.userID == user.accountID,
         Payment.paymentStatus.in_(["pending", "completed"])
-    ).count()
+    ).first() is not None
     
-    if active_participations > 0:
+    if has_participation:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Không thể xóa tài khoản đã tham gia đấu giá"
         )
     
     # Check if user has any active bids
-    active_bids = db.query(Bid).filter(
+    has_active_bids = db.query(Bid.bidID).filter(
         Bid.userID == user.accountID,
         Bid.bidStatus == "active"
-    ).count()
+    ).first() is not None
     
-    if active_bids > 0:
+    if has_active_bids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Không thể xóa tài khoản đã đặt giá thầu"
@@ -677,7 +666,7 @@ async def reset_password(
         )
     
     # Hash new password
-    user.password = get_password_hash(reset_data.new_password)
+    user.password = await aget_password_hash(reset_data.new_password)
     db.commit()
     
     return schemas.PasswordResetResponse(
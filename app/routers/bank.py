@@ -8,7 +8,7 @@ from datetime import datetime
 import uuid
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 from ..bank_port import BankPort
 
@@ -17,15 +17,6 @@ router = APIRouter(prefix="/bank", tags=["Mock Bank API"])
 # Initialize bank port
 bank_port = BankPort()
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # =================== DEPOSIT ENDPOINTS (Đặt cọc) =================== #
 
 @router.post("/deposit/create")
@@ -1,27 +1,20 @@
 """
 Bidding endpoints (UC17 - Place bid, UC18 - Cancel bid)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from typing import Optional
 import asyncio
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
+from ..utils.pagination import get_cursor, set_next_cursor
 
 router = APIRouter(prefix="/bids", tags=["Bidding"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/place", response_model=schemas.Bid)
 def place_bid(
     bid: schemas.BidCreate,
@@ -72,22 +65,25 @@ def place_bid(
             detail="You must register and pay the deposit before placing bids. Please register for participation first."
         )
     
-    # Get current highest bid before placing new bid
-    previous_highest_bid = crud.get_current_highest_bid(db=db, auction_id=bid.auction_id)
-    min_bid_amount = auction.price_step  # Default minimum
-    
-    if previous_highest_bid:
-        min_bid_amount = previous_highest_bid.bid_price + auction.price_step
+    # Check the price against the current highest bid and create the bid
+    # atomically, so concurrent bidders cannot both beat the same highest bid
+    placement = crud.place_bid(db=db, bid=bid, user_id=current_user.account_id)
+    if placement is None:
+        # The auction ended (or was deleted) after the checks above
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Auction is not currently active"
+        )
     
     # Validate bid amount
-    if bid.bid_price < min_bid_amount:
+    if placement.bid is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Bid must be at least {min_bid_amount} VND"
+            detail=f"Bid must be at least {placement.min_price} VND"
         )
     
-    # Create bid
-    db_bid = crud.create_bid(db=db, bid=bid, user_id=current_user.account_id)
+    db_bid = placement.bid
+    previous_highest_bid = placement.previous_highest
     
     # Check if bid is placed in the last 5 minutes (auto-extend)
     extended = False
@@ -101,13 +97,9 @@ def place_bid(
     
     # Send real-time notifications
     try:
-        # Get all bids for this auction to determine participants
-        all_bids = crud.get_bids_by_auction(db=db, auction_id=bid.auction_id)
-        participant_user_ids = set(bid.user_id for bid in all_bids)
-        
-        # Get updated highest bid info
-        new_highest_bid = crud.get_current_highest_bid(db=db, auction_id=bid.auction_id)
-        highest_bidder = crud.get_account_by_id(db=db, account_id=new_highest_bid.user_id) if new_highest_bid else None
+        # The new bid was checked against the previous highest, so it is the
+        # highest now and the current user is the highest bidder
+        total_bids = crud.count_bids_by_auction(db=db, auction_id=bid.auction_id)
         
         # Prepare bid update message
         bid_update_message = {
@@ -115,13 +107,13 @@ def place_bid(
             "data": {
                 "auction_id": bid.auction_id,
                 "auction_name": auction.auction_name,
-                "new_highest_bid": new_highest_bid.bid_price if new_highest_bid else bid.bid_price,
+                "new_highest_bid": bid.bid_price,
                 "new_highest_bidder": {
-                    "user_id": highest_bidder.account_id if highest_bidder else current_user.account_id,
-                    "username": highest_bidder.username if highest_bidder else current_user.username,
-                    "name": f"{highest_bidder.first_name} {highest_bidder.last_name}".strip() if highest_bidder else f"{current_user.first_name} {current_user.last_name}".strip()
+                    "user_id": current_user.account_id,
+                    "username": current_user.username,
+                    "name": f"{current_user.first_name} {current_user.last_name}".strip()
                 },
-                "total_bids": len(all_bids),
+                "total_bids": total_bids,
                 "extended": extended,
                 "new_end_time": updated_auction.end_date.isoformat() if extended else auction.end_date.isoformat(),
                 "bid_timestamp": db_bid.created_at.isoformat()
@@ -130,7 +122,7 @@ def place_bid(
         }
         
         # Send to all participants
-        asyncio.create_task(crud.broadcast_to_auction_participants(db, bid.auction_id, bid_update_message))
+        asyncio.create_task(crud.broadcast_to_auction_participants(bid.auction_id, bid_update_message))
         
         # If someone was outbid, send specific notification
         if previous_highest_bid and previous_highest_bid.user_id != current_user.account_id:
@@ -275,36 +267,41 @@ def cancel_bid(
 
 @router.get("/my-bids", response_model=list[schemas.Bid])
 def get_my_bids(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[schemas.Cursor] = Depends(get_cursor),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get user's bid history
     
-    GET /bids/my-bids
+    GET /bids/my-bids?limit=100&cursor=<X-Next-Cursor>
     Headers: Authorization: Bearer <access_token>
-    Returns: List of user's bids
+    Returns: List of user's bids; X-Next-Cursor header holds the next page's cursor
     """
-    bids = crud.get_bids_by_user(db=db, user_id=current_user.account_id, skip=skip, limit=limit)
+    bids = crud.get_bids_by_user(db=db, user_id=current_user.account_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, bids, limit, "bidID")
     return bids
 
 
 @router.get("/auction/{auction_id}", response_model=list[schemas.Bid])
 def get_auction_bids(
     auction_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[schemas.Cursor] = Depends(get_cursor),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all bids for an auction
     
-    GET /bids/auction/{auction_id}
+    GET /bids/auction/{auction_id}?limit=100&cursor=<X-Next-Cursor>
     Headers: Authorization: Bearer <access_token>
-    Returns: List of bids for the auction
+    Returns: List of bids for the auction, highest first; X-Next-Cursor header holds the next page's cursor
     """
     # Get auction
     auction = crud.get_auction(db=db, auction_id=auction_id)
@@ -314,7 +311,8 @@ def get_auction_bids(
             detail="Auction not found"
         )
     
-    bids = crud.get_bids_by_auction(db=db, auction_id=auction_id, skip=skip, limit=limit)
+    bids = crud.get_bids_by_auction(db=db, auction_id=auction_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, bids, limit, "bidID", "bidPrice")
     return bids
 
 
@@ -9,7 +9,7 @@ import os
 from pathlib import Path
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 from ..utils.image_handler import (
     save_image, 
@@ -22,14 +22,6 @@ from ..utils.image_handler import (
 
 router = APIRouter(prefix="/images", tags=["Image Management"])
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/upload")
 async def upload_image(
     file: UploadFile = File(...),
@@ -1,77 +1,102 @@
 """
 Notification management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import AsyncSessionLocal, get_db
 from ..routers.auth import get_current_user
+from ..utils.pagination import get_cursor, set_next_cursor
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+async def get_async_db():
+    """Dependency to get an async database session for endpoints on the event loop"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 @router.get("/", response_model=list[schemas.Notification])
-def get_notifications(
+async def get_notifications(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[schemas.Cursor] = Depends(get_cursor),
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user's notifications
     
-    GET /notifications?skip=0&limit=50
+    GET /notifications?limit=50&cursor=<X-Next-Cursor>
     Headers: Authorization: Bearer <access_token>
-    Returns: List of notifications
+    Returns: List of notifications, newest first; X-Next-Cursor header holds the next page's cursor
     """
-    notifications = crud.get_notifications_by_user(db, current_user.account_id, skip=skip, limit=limit)
+    notifications = await crud.aget_notifications_by_user(db, current_user.account_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, notifications, limit, "notificationID", "createdAt")
     return notifications
 
 
 @router.get("/unread", response_model=list[schemas.Notification])
-def get_unread_notifications(
+async def get_unread_notifications(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[schemas.Cursor] = Depends(get_cursor),
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get unread notifications
     
-    GET /notifications/unread?skip=0&limit=50
+    GET /notifications/unread?limit=50&cursor=<X-Next-Cursor>
     Headers: Authorization: Bearer <access_token>
-    Returns: List of unread notifications
+    Returns: List of unread notifications, newest first; X-Next-Cursor header holds the next page's cursor
     """
-    notifications = crud.get_unread_notifications_by_user(db, current_user.account_id, skip=skip, limit=limit)
+    notifications = await crud.aget_unread_notifications_by_user(db, current_user.account_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, notifications, limit, "notificationID", "createdAt")
     return notifications
 
 
 @router.get("/unread/count", response_model=dict)
-def get_unread_count(
+async def get_unread_count(
+    cap: Optional[int] = Query(None, ge=1),
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get count of unread notifications
     
-    GET /notifications/unread/count
+    GET /notifications/unread/count?cap=10
     Headers: Authorization: Bearer <access_token>
-    Returns: { "count": 5 }
+    Returns: { "count": 5 } - with cap, counting stops at cap (e.g. for a "9+" badge)
     """
-    count = crud.get_unread_count(db, current_user.account_id)
+    if cap is not None:
+        count = await crud.aget_unread_count_capped(db, current_user.account_id, cap)
+    else:
+        count = await crud.aget_unread_count(db, current_user.account_id)
     return {"count": count}
 
 
+@router.get("/unread/exists", response_model=dict)
+async def has_unread_notifications(
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Check whether there are unread notifications
+    
+    GET /notifications/unread/exists
+    Headers: Authorization: Bearer <access_token>
+    Returns: { "has_unread": true }
+    """
+    return {"has_unread": await crud.ahas_unread(db, current_user.account_id)}
+
+
 @router.put("/{notification_id}/read", response_model=schemas.Notification)
 def mark_notification_read(
     notification_id: int,
@@ -205,10 +230,7 @@ def get_auction_notifications(
         )
     
     # Get all user notifications for this auction
-    all_notifications = crud.get_notifications_by_user(db, current_user.account_id, skip=0, limit=1000)
-    auction_notifications = [n for n in all_notifications if n.auction_id == auction_id]
-    
-    return auction_notifications
+    return crud.get_notifications_by_user_and_auction(db, current_user.account_id, auction_id)
 
 
 @router.post("/test", response_model=schemas.MessageResponse)
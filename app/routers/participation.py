@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 import asyncio
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 from ..utils.qr_token import generate_payment_token, generate_qr_url
 from ..utils import mailer
@@ -15,15 +15,6 @@ from ..utils import mailer
 router = APIRouter(prefix="/participation", tags=["Participation"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/register", response_model=schemas.MessageResponse)
 async def register_for_auction(
     auction_id: int,
@@ -1,30 +1,22 @@
 """
 Payment management endpoints (UC01 - Update payment status, UC14 - View payment status, UC19 - Make payment)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 from ..utils.qr_token import verify_payment_token, invalidate_token, get_token_status, generate_payment_token, generate_qr_url
 from ..utils import mailer
+from ..utils.pagination import get_cursor, set_next_cursor
 import asyncio
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/create", response_model=schemas.Payment)
 async def create_payment(
     payment: schemas.PaymentCreate,
@@ -180,19 +172,22 @@ def update_payment_status(
 
 @router.get("/my-payments", response_model=list[schemas.Payment])
 def get_my_payments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[schemas.Cursor] = Depends(get_cursor),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get current user's payments
     
-    GET /payments/my-payments
+    GET /payments/my-payments?limit=100&cursor=<X-Next-Cursor>
     Headers: Authorization: Bearer <access_token>
-    Returns: List of user's payments
+    Returns: List of user's payments; X-Next-Cursor header holds the next page's cursor
     """
-    payments = crud.get_payments_by_user(db=db, user_id=current_user.account_id, skip=skip, limit=limit)
+    payments = crud.get_payments_by_user(db=db, user_id=current_user.account_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, payments, limit, "paymentID")
     return payments
 
 
@@ -377,13 +372,9 @@ async def process_payment(
     updated_payment = crud.update_payment_status(db=db, payment_id=payment_id, status="completed")
     
     # Get user and auction info for email
-    user = db.query(crud.models.Account).filter(
-        crud.models.Account.account_id == payment.user_id
-    ).first()
+    user = crud.get_account_by_id(db, payment.user_id)
     
-    auction = db.query(crud.models.Auction).filter(
-        crud.models.Auction.auction_id == payment.auction_id
-    ).first()
+    auction = crud.get_auction(db, payment.auction_id)
     
     # Send confirmation email
     if user and auction:
@@ -466,13 +457,9 @@ async def qr_payment_callback(
         updated_payment = crud.update_payment_status(db=db, payment_id=payment.payment_id, status="completed")
         
         # Get user and auction info for email
-        user = db.query(crud.models.Account).filter(
-            crud.models.Account.account_id == payment.user_id
-        ).first()
+        user = crud.get_account_by_id(db, payment.user_id)
         
-        auction = db.query(crud.models.Auction).filter(
-            crud.models.Auction.auction_id == payment.auction_id
-        ).first()
+        auction = crud.get_auction(db, payment.auction_id)
         
         # Send confirmation email
         if user and auction:
@@ -1,29 +1,21 @@
 """
 Product management endpoints (UC09 - Register product, UC13 - Approve product)
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Response, status, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import json
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 from ..utils.image_handler import save_image, get_image_url, validate_image_file
+from ..utils.pagination import get_cursor, set_next_cursor
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/register", response_model=schemas.Product)
 def register_product(
     product: schemas.ProductCreate,
@@ -176,14 +168,21 @@ async def register_product_with_images(
 
 
 @router.get("/", response_model=list[schemas.Product])
-def get_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_products(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[schemas.Cursor] = Depends(get_cursor),
+    db: Session = Depends(get_db)
+):
     """
     Get all products
     
-    GET /products?skip=0&limit=100
-    Returns: List of products
+    GET /products?limit=100&cursor=<X-Next-Cursor>
+    Returns: List of products; X-Next-Cursor header holds the next page's cursor
     """
-    products = crud.get_products(db=db, skip=skip, limit=limit)
+    products = crud.get_products(db=db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, products, limit, "productID")
     
     # Parse additionalImages JSON string back to list for each product
     parsed_products = []
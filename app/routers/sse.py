@@ -9,21 +9,12 @@ import json
 import asyncio
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 
 router = APIRouter(prefix="/sse", tags=["Server-Sent Events"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 async def sse_notifications_stream(user_id: int, db: Session):
     """Generate SSE stream for user notifications"""
     try:
@@ -74,7 +65,7 @@ async def sse_auction_stream(auction_id: int, db: Session):
                 'auction_id': auction_id,
                 'auction_name': auction.auction_name,
                 'current_price': current_highest_bid.bid_price if current_highest_bid else None,
-                'bid_count': len(crud.get_bids_by_auction(db, auction_id)),
+                'bid_count': crud.count_bids_by_auction(db, auction_id),
                 'status': auction.auction_status,
                 'timestamp': datetime.utcnow().isoformat()
             })}\n\n"
@@ -6,21 +6,12 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 
 router = APIRouter(prefix="/status", tags=["Status Management"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.put("/product/{product_id}", response_model=schemas.Product)
 def update_product_status(
     product_id: int,
@@ -169,8 +160,7 @@ def get_product_status(
         )
     
     # Get auctions for this product
-    all_auctions = crud.get_auctions(db=db, skip=0, limit=1000)
-    product_auctions = [a for a in all_auctions if a.product_id == product_id]
+    product_auctions = crud.get_auctions_by_product(db=db, product_id=product_id)
     
     if not product_auctions:
         return {
@@ -8,28 +8,19 @@ import json
 import asyncio
 
 from .. import crud, schemas
-from ..database import SessionLocal
+from ..database import get_db
 from ..routers.auth import get_current_user
 from ..auth import verify_token
 
 router = APIRouter(prefix="/ws", tags=["WebSocket"])
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 async def verify_websocket_token(token: str) -> dict | None:
     """Verify WebSocket authentication token"""
     try:
         payload = verify_token(token, token_type="access")
         return payload
-    except:
+    except Exception:
         return None
 
 
@@ -64,7 +55,7 @@ async def websocket_notifications(websocket: WebSocket, token: str, db: Session
     
     try:
         # Send connection confirmation
-        await websocket.send_json({
+        crud.send_to_connection(user.accountID, websocket, {
             "type": "connection_established",
             "data": {
                 "user_id": user.accountID,
@@ -76,7 +67,7 @@ async def websocket_notifications(websocket: WebSocket, token: str, db: Session
         
         # Send unread notification count
         unread_count = crud.get_unread_count(db, user.accountID)
-        await websocket.send_json({
+        crud.send_to_connection(user.accountID, websocket, {
             "type": "unread_count",
             "data": {"count": unread_count},
             "timestamp": datetime.utcnow().isoformat()
@@ -93,7 +84,7 @@ async def websocket_notifications(websocket: WebSocket, token: str, db: Session
                 message_type = message_data.get("type")
                 
                 if message_type == "ping":
-                    await websocket.send_json({
+                    crud.send_to_connection(user.accountID, websocket, {
                         "type": "pong",
                         "timestamp": datetime.utcnow().isoformat()
                     })
@@ -101,7 +92,7 @@ async def websocket_notifications(websocket: WebSocket, token: str, db: Session
                 elif message_type == "subscribe_auction":
                     auction_id = message_data.get("auction_id")
                     # In a real implementation, you might track subscription preferences
-                    await websocket.send_json({
+                    crud.send_to_connection(user.accountID, websocket, {
                         "type": "subscription_confirmed",
                         "data": {"auction_id": auction_id},
                         "timestamp": datetime.utcnow().isoformat()
@@ -109,7 +100,7 @@ async def websocket_notifications(websocket: WebSocket, token: str, db: Session
                 
                 elif message_type == "unsubscribe_auction":
                     auction_id = message_data.get("auction_id")
-                    await websocket.send_json({
+                    crud.send_to_connection(user.accountID, websocket, {
                         "type": "unsubscription_confirmed",
                         "data": {"auction_id": auction_id},
                         "timestamp": datetime.utcnow().isoformat()
@@ -117,14 +108,14 @@ async def websocket_notifications(websocket: WebSocket, token: str, db: Session
                 
                 else:
                     # Unknown message type
-                    await websocket.send_json({
+                    crud.send_to_connection(user.accountID, websocket, {
                         "type": "error",
                         "data": {"message": f"Unknown message type: {message_type}"},
                         "timestamp": datetime.utcnow().isoformat()
                     })
             
             except json.JSONDecodeError:
-                await websocket.send_json({
+                crud.send_to_connection(user.accountID, websocket, {
                     "type": "error",
                     "data": {"message": "Invalid JSON message"},
                     "timestamp": datetime.utcnow().isoformat()
@@ -141,7 +132,7 @@ async def websocket_notifications(websocket: WebSocket, token: str, db: Session
         print(f"WebSocket error for user {user.accountID}: {e}")
         try:
             await websocket.close(code=4500, reason="Internal server error")
-        except:
+        except RuntimeError:
             pass
     
     finally:
@@ -189,16 +180,16 @@ async def websocket_auction_updates(websocket: WebSocket, auction_id: int, token
         current_highest_bid = crud.get_current_highest_bid(db, auction_id)
         highest_bidder = None
         if current_highest_bid:
-            highest_bidder = crud.get_account_by_id(db, current_highest_bid.user_id)
+            highest_bidder = crud.get_account_display(db, current_highest_bid.userID)
         
-        await websocket.send_json({
+        crud.send_to_connection(user.accountID, websocket, {
             "type": "auction_initial_data",
             "data": {
                 "auction_id": auction_id,
                 "auction_name": auction.auctionName,
                 "current_highest_bid": current_highest_bid.bidPrice if current_highest_bid else None,
                 "highest_bidder_name": f"{highest_bidder.firstName} {highest_bidder.lastName}".strip() if highest_bidder else None,
-                "bid_count": len(crud.get_bids_by_auction(db, auction_id)),
+                "bid_count": crud.count_bids_by_auction(db, auction_id),
                 "auction_status": auction.auctionStatus,
                 "end_time": auction.endDate.isoformat()
             },
@@ -213,7 +204,7 @@ async def websocket_auction_updates(websocket: WebSocket, auction_id: int, token
                 message_data = json.loads(data)
                 
                 if message_data.get("type") == "ping":
-                    await websocket.send_json({
+                    crud.send_to_connection(user.accountID, websocket, {
                         "type": "pong",
                         "timestamp": datetime.utcnow().isoformat()
                     })
@@ -231,7 +222,7 @@ async def websocket_auction_updates(websocket: WebSocket, auction_id: int, token
         print(f"Auction WebSocket error for user {user.accountID}: {e}")
         try:
             await websocket.close(code=4500, reason="Internal server error")
-        except:
+        except RuntimeError:
             pass
     
     finally:
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Optional, List, Union
 from datetime import datetime, date
 from enum import Enum
 
@@ -15,23 +16,6 @@ class AccountStatus(str, Enum):
     SUSPENDED = "suspended"
 
 
-# ========== EXISTING ITEM SCHEMAS ========== #
-class ItemBase(BaseModel):
-    title: str
-    description: Optional[str] = None
-
-
-class ItemCreate(ItemBase):
-    pass
-
-
-class Item(ItemBase):
-    id: int
-
-    class Config:
-        from_attributes = True
-
-
 # ========== AUTH SCHEMAS ========== #
 class LoginRequest(BaseModel):
     username: str
@@ -63,8 +47,7 @@ class UserResponse(BaseModel):
     lastLoginAt: Optional[datetime] = None
     isAuthenticated: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ========== OTP & PASSWORD RECOVERY SCHEMAS ========== #
@@ -212,8 +195,7 @@ class Product(ProductBase):
     createdAt: datetime
     updatedAt: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProductUpdate(BaseModel):
@@ -251,8 +233,7 @@ class Auction(AuctionBase):
     createdAt: datetime
     updatedAt: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AuctionUpdate(BaseModel):
@@ -269,8 +250,7 @@ class AuctionDetail(Auction):
     bids: List["Bid"] = []
     currentPrice: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AuctionSearch(BaseModel):
@@ -297,8 +277,7 @@ class Bid(BidBase):
     bidStatus: Optional[str] = None
     createdAt: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ========== PAYMENT SCHEMAS ========== #
@@ -320,12 +299,11 @@ class Payment(PaymentBase):
     userID: int
     paymentStatus: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PaymentStatusUpdate(BaseModel):
-    paymentStatus: str
+    paymentStatus: str = Field(max_length=20)  # Payment.paymentStatus is String(20)
 
 
 class ProductStatusUpdate(BaseModel):
@@ -344,8 +322,22 @@ class AuctionParticipation(BaseModel):
     participationStatus: Optional[str] = None
     createdAt: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ========== PAGINATION SCHEMAS ========== #
+class Cursor(BaseModel):
+    """Keyset pagination position: the last row of the previous page"""
+    id: int
+    key: Optional[Union[int, datetime]] = None  # leading sort value (bidPrice, createdAt) when not sorted by ID
+
+    def encode(self) -> str:
+        """Opaque token handed to clients as the next page's cursor"""
+        return urlsafe_b64encode(self.model_dump_json(exclude_none=True).encode()).decode()
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        return cls.model_validate_json(urlsafe_b64decode(token.encode()))
 
 
 # ========== RESPONSE SCHEMAS ========== #
@@ -384,8 +376,7 @@ class Notification(NotificationBase):
     createdAt: datetime
     readAt: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class NotificationUpdate(BaseModel):
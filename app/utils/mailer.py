@@ -3,12 +3,11 @@ Email utilities for sending HTML emails with OTP codes
 """
 import asyncio
 from datetime import datetime
-from email.message import EmailMessage
 from typing import Optional
-import aiosmtplib
 from jose import jwt, JWTError
 from configs.config_mail import mail_settings
 from app.config import settings
+from app.email_port import email_port
 
 
 async def send_email(
@@ -29,34 +28,34 @@ async def send_email(
     Returns:
         bool: True if email sent successfully, False otherwise
     """
-    try:
-        message = EmailMessage()
-        message["From"] = f"{mail_settings.MAIL_FROM_NAME} <{mail_settings.MAIL_FROM_ADDRESS}>"
-        message["To"] = target_address
-        message["Subject"] = subject
-        message["Date"] = datetime.now()
-        
-        if is_html:
-            message.set_content(content, subtype="html")
-        else:
-            message.set_content(content)
-        
-        await aiosmtplib.send(
-            message,
-            hostname=mail_settings.MAIL_HOST,
-            port=mail_settings.MAIL_PORT,
-            start_tls=mail_settings.MAIL_USE_TLS,
-            username=mail_settings.MAIL_USERNAME,
-            password=mail_settings.MAIL_PASSWORD,
-            timeout=mail_settings.MAIL_TIMEOUT
-        )
-        
-        print(f"Email sent successfully to {target_address}")
-        return True
-        
-    except Exception as e:
-        print(f"Failed to send email to {target_address}: {str(e)}")
-        return False
+    # Sent over EmailPort's pooled SMTP connections instead of opening a new
+    # connection (and TLS handshake and login) for every email
+    result = await email_port.send_raw_email(subject, content, target_address, is_html)
+    return result.success
+
+
+def queue_email(
+    subject: str,
+    content: str,
+    target_address: str,
+    is_html: bool = True
+) -> bool:
+    """
+    Queue email for background delivery without waiting for SMTP
+    
+    Args:
+        subject: Email subject line
+        content: Email body content (HTML or plain text)
+        target_address: Recipient email address
+        is_html: Whether content is HTML formatted
+    
+    Returns:
+        bool: True if email was queued, False otherwise (bad address or full queue)
+    """
+    result = email_port.enqueue({
+        "subject": subject, "content": content, "target_address": target_address, "is_html": is_html
+    })
+    return result.success
 
 
 async def send_otp_email(
@@ -197,7 +196,8 @@ async def send_otp_email(
     </html>
     """
     
-    # Send email
+    # Sent synchronously, not queued: callers report a failed OTP email to the
+    # user, which needs the SMTP outcome
     return await send_email(subject, html_content, target_address, is_html=True)
 
 
@@ -210,7 +210,7 @@ async def send_welcome_email(username: str, email: str) -> bool:
         email: Recipient email address
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if email was queued for delivery, False otherwise
     """
     
     subject = "Chào mừng đến với Auction System!"
@@ -288,6 +288,8 @@ async def send_welcome_email(username: str, email: str) -> bool:
     </html>
     """
     
+    return queue_email(subject, html_content, email, is_html=True)
+
 
 async def send_deposit_email(
     username: str,
@@ -309,7 +311,7 @@ async def send_deposit_email(
         expires_at: Token expiration datetime
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if email was queued for delivery, False otherwise
     """
     
     subject = f"Thanh toán đặt cọc tham gia đấu giá - {auction_name}"
@@ -434,7 +436,7 @@ async def send_deposit_email(
     </html>
     """
     
-    return await send_email(subject, html_content, email, is_html=True)
+    return queue_email(subject, html_content, email, is_html=True)
 
 
 async def send_payment_email(
@@ -457,7 +459,7 @@ async def send_payment_email(
         expires_at: Token expiration datetime
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if email was queued for delivery, False otherwise
     """
     
     subject = f"🎉 Chúc mừng! Bạn đã thắng đấu giá - {auction_name}"
@@ -588,7 +590,7 @@ async def send_payment_email(
     </html>
     """
     
-    return await send_email(subject, html_content, email, is_html=True)
+    return queue_email(subject, html_content, email, is_html=True)
 
 
 async def send_payment_confirmation_email(
@@ -611,7 +613,7 @@ async def send_payment_confirmation_email(
         payment_method: Payment method used
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if email was queued for delivery, False otherwise
     """
     
     if payment_type == "deposit":
@@ -753,4 +755,4 @@ async def send_payment_confirmation_email(
     </html>
     """
     
-    return await send_email(subject, html_content, email, is_html=True)
\ No newline at end of file
+    return queue_email(subject, html_content, email, is_html=True)
\ No newline at end of file
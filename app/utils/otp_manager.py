@@ -106,7 +106,7 @@ def validate_otp_token(
             }
         
         # Check purpose
-        if payload.get("purpose") != purpose:
+        if not hmac.compare_digest(str(payload.get("purpose", "")), purpose):
             return {
                 "success": False,
                 "remaining_trials": 0,
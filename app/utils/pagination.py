@@ -0,0 +1,40 @@
+"""
+Keyset pagination helpers for list endpoints
+"""
+from typing import Optional, Sequence
+from fastapi import HTTPException, Query, Response, status
+
+from app.schemas import Cursor
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def get_cursor(
+    cursor: Optional[str] = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header; replaces skip")
+) -> Optional[Cursor]:
+    """Dependency decoding the cursor query parameter"""
+    if cursor is None:
+        return None
+    try:
+        return Cursor.decode(cursor)
+    except ValueError:  # bad base64 or JSON; pydantic's ValidationError is a ValueError
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int, id_attr: str, key_attr: str = None) -> None:
+    """
+    Set the next page's cursor from the last row of a full page
+    
+    Args:
+        id_attr: Primary key attribute of the rows
+        key_attr: Leading sort attribute, for listings not sorted by ID
+    """
+    if not rows or len(rows) < limit:
+        return
+    last = rows[-1]
+    cursor = Cursor(id=getattr(last, id_attr), key=getattr(last, key_attr) if key_attr else None)
+    response.headers[NEXT_CURSOR_HEADER] = cursor.encode()
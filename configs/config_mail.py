@@ -1,10 +1,10 @@
 """
 Email configuration module for SMTP settings
 """
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from app.config import EnvSettings
 
 
-class MailSettings(BaseSettings):
+class MailSettings(EnvSettings):
     """Email settings from environment variables"""
     
     # SMTP Configuration
@@ -18,7 +18,12 @@ class MailSettings(BaseSettings):
     # Email settings
     MAIL_USE_TLS: bool
     MAIL_USE_SSL: bool
-    MAIL_TIMEOUT: int
+    MAIL_TIMEOUT: int  # connect/TLS/login and single commands
+    MAIL_SEND_TIMEOUT: int = 7  # whole MAIL/RCPT/DATA exchange of one message
+    
+    # Open SMTP connections kept for reuse across sends
+    MAIL_POOL_SIZE: int = 5
+    MAIL_MAX_MESSAGES_PER_CONNECTION: int = 100
     
     # App settings
     APP_URL: str
@@ -26,13 +31,6 @@ class MailSettings(BaseSettings):
     
     # Frontend URL for email links
     FRONTEND_URL: str
-    
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        extra="ignore"
-    )
 
 
 # Global mail settings instance
@@ -0,0 +1,4 @@
+-- FULLTEXT index for auction name search (MySQL).
+-- Tables created by the app already have it; run this once on databases
+-- created before it existed. Until then search falls back to LIKE.
+ALTER TABLE auction ADD FULLTEXT ix_auction_name_ft (auctionName);
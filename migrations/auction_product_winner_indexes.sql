@@ -0,0 +1,7 @@
+-- Explicit indexes for auction product and winner lookups (MySQL).
+-- Tables created by the app already have them; run this once on databases
+-- created before they existed. MySQL drops the implicit foreign key
+-- indexes on these columns once the explicit ones exist.
+ALTER TABLE auction
+    ADD INDEX ix_auction_productID (productID),
+    ADD INDEX ix_auction_bidWinnerID (bidWinnerID);
@@ -0,0 +1,4 @@
+-- Composite index for auction filters on status and price step (MySQL).
+-- Tables created by the app already have it; run this once on databases
+-- created before it existed.
+ALTER TABLE auction ADD INDEX ix_auction_status_price_step (auctionStatus, priceStep);
@@ -0,0 +1,12 @@
+-- Composite indexes for bid and notification listings (MySQL).
+-- Tables created by the app already have them; run this once on databases
+-- created before they existed. The composites lead with the foreign key
+-- column, so they are added first and the single-column indexes they
+-- replace are dropped after.
+ALTER TABLE bid
+    ADD INDEX ix_bid_auction_price (auctionID, bidPrice),
+    ADD INDEX ix_bid_auction_status_price (auctionID, bidStatus, bidPrice);
+ALTER TABLE bid DROP INDEX ix_bid_auctionID;
+
+ALTER TABLE notification ADD INDEX ix_notification_user_created (userID, createdAt);
+ALTER TABLE notification DROP INDEX ix_notification_userID;
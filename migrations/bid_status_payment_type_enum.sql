@@ -0,0 +1,6 @@
+-- Store bid.bidStatus and payment.paymentType as ENUM columns (MySQL).
+-- Tables created by the app already use them; run this once on databases
+-- created before, after payment_status_type_width.sql. The lists match
+-- BidStatus and PaymentType in app/models.py.
+ALTER TABLE bid MODIFY bidStatus ENUM('active', 'cancelled') NULL;
+ALTER TABLE payment MODIFY paymentType ENUM('deposit', 'final_payment') NOT NULL;
@@ -0,0 +1,4 @@
+-- Composite index for unread notification counts (MySQL).
+-- Tables created by the app already have it; run this once on databases
+-- created before it existed.
+ALTER TABLE notification ADD INDEX ix_notification_user_unread (userID, isRead);
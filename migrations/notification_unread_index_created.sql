@@ -0,0 +1,6 @@
+-- Extend the unread notification index with createdAt for keyset
+-- pagination (MySQL). Run after notification_unread_index.sql on databases
+-- created before the index included createdAt.
+ALTER TABLE notification
+    DROP INDEX ix_notification_user_unread,
+    ADD INDEX ix_notification_user_unread (userID, isRead, createdAt);
@@ -0,0 +1,12 @@
+-- Composite indexes for payment and payment token lookups (MySQL).
+-- Tables created by the app already have them; run this once on databases
+-- created before they existed. The composites lead with the foreign key
+-- column, so they are added first and the single-column indexes they
+-- replace are dropped after.
+ALTER TABLE payment
+    ADD INDEX ix_payment_auction_user_type (auctionID, userID, paymentType),
+    ADD INDEX ix_payment_user_status (userID, paymentStatus);
+ALTER TABLE payment DROP INDEX ix_payment_auctionID;
+
+ALTER TABLE payment_token ADD INDEX ix_payment_token_payment_used (paymentID, isUsed);
+ALTER TABLE payment_token DROP INDEX ix_payment_token_paymentID;
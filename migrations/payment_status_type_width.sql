@@ -0,0 +1,7 @@
+-- Narrow payment.paymentStatus and payment.paymentType to VARCHAR(20)
+-- (MySQL). Tables created by the app already use it; run this once on
+-- databases created before. Every value the app writes fits; check for
+-- longer hand-written values first, strict mode rejects them.
+ALTER TABLE payment
+    MODIFY paymentStatus VARCHAR(20) NULL,
+    MODIFY paymentType VARCHAR(20) NOT NULL;
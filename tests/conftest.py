@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from itertools import count
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.database import Base
+
+
+# crud tests run against an in-memory SQLite database instead of DATABASE_URL
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+Base.metadata.create_all(bind=engine)
+TestingSessionLocal = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+_ids = count(1)
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def make_account(db):
+    def make(password="x"):
+        n = next(_ids)
+        account = models.Account(
+            username=f"user{n}", password=password, firstName="Test", lastName=f"User{n}",
+            email=f"user{n}@example.com"
+        )
+        db.add(account)
+        db.commit()
+        return account
+    return make
+
+
+@pytest.fixture
+def make_auction(db):
+    def make(end_date=None, price_step=1000):
+        product = models.Product(productName="Lamp")
+        db.add(product)
+        db.flush()
+        auction = models.Auction(
+            auctionName="Lamp auction", productID=product.productID,
+            startDate=datetime.utcnow() - timedelta(hours=1),
+            endDate=end_date or datetime.utcnow() + timedelta(hours=1),
+            priceStep=price_step, auctionStatus="active"
+        )
+        db.add(auction)
+        db.commit()
+        return auction
+    return make
@@ -0,0 +1,37 @@
+import time
+from datetime import timedelta
+
+from app import auth
+
+
+def test_repeated_verification_is_served_from_cache():
+    token = auth.create_access_token({"sub": "alice"})
+    assert auth.verify_token(token)["sub"] == "alice"
+    hits = auth._decode_token.cache_info().hits
+
+    payload = auth.verify_token(token)
+    assert auth._decode_token.cache_info().hits == hits + 1
+
+    # Callers get a copy, so mutating it does not change the cached payload
+    payload["sub"] = "mallory"
+    assert auth.verify_token(token)["sub"] == "alice"
+
+
+def test_cached_token_is_rejected_once_expired(monkeypatch):
+    token = auth.create_access_token({"sub": "alice"}, expires_delta=timedelta(seconds=60))
+    assert auth.verify_token(token) is not None
+
+    now = time.time()
+    monkeypatch.setattr(auth.time, "time", lambda: now + 120)
+    assert auth.verify_token(token) is None
+
+
+def test_cached_token_is_checked_against_the_requested_type():
+    token = auth.create_refresh_token({"sub": "alice"})
+    assert auth.verify_token(token, "refresh") is not None
+    assert auth.verify_token(token, "access") is None
+
+
+def test_invalid_token_is_rejected():
+    token = auth.create_access_token({"sub": "alice"})
+    assert auth.verify_token(token[:-2] + "xx") is None
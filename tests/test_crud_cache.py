@@ -0,0 +1,62 @@
+from app import crud, schemas
+
+
+def test_update_account_invalidates_snapshot_and_display(db, make_account):
+    account = make_account()
+    assert crud.get_account_snapshot(db, account.username).firstName == "Test"
+    assert crud.get_account_display(db, account.accountID).firstName == "Test"
+
+    crud.update_account(db, account.accountID, schemas.AccountUpdate(firstName="Renamed"))
+
+    assert crud.get_account_snapshot(db, account.username).firstName == "Renamed"
+    assert crud.get_account_display(db, account.accountID).firstName == "Renamed"
+
+
+def test_delete_account_invalidates_snapshot(db, make_account):
+    account = make_account()
+    assert crud.get_account_snapshot(db, account.username) is not None
+
+    assert crud.delete_unactivated_account(db, account.username)
+
+    assert crud.get_account_snapshot(db, account.username) is None
+    assert crud.get_account_display(db, account.accountID) is None
+
+
+def test_new_bid_invalidates_cached_highest_bid(db, make_account, make_auction):
+    auction, bidder = make_auction(), make_account()
+    assert crud.get_current_highest_bid(db, auction.auctionID) is None
+
+    bid = crud.create_bid(db, schemas.BidCreate(auctionID=auction.auctionID, bidPrice=1000), bidder.accountID)
+
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == bid.bidID
+
+
+def test_cancelled_highest_bid_is_not_served_from_cache(db, make_account, make_auction):
+    auction, bidder = make_auction(), make_account()
+    lower = crud.create_bid(db, schemas.BidCreate(auctionID=auction.auctionID, bidPrice=1000), bidder.accountID)
+    higher = crud.create_bid(db, schemas.BidCreate(auctionID=auction.auctionID, bidPrice=2000), bidder.accountID)
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == higher.bidID
+
+    assert crud.cancel_bid(db, higher.bidID, bidder.accountID)
+
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == lower.bidID
+
+
+def test_cancel_bid_drops_cached_highest_bid(db, make_account, make_auction):
+    auction, bidder = make_auction(), make_account()
+    bid = crud.create_bid(db, schemas.BidCreate(auctionID=auction.auctionID, bidPrice=1000), bidder.accountID)
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == bid.bidID
+    assert auction.auctionID in crud._highest_bid_cache
+
+    assert crud.cancel_bid(db, bid.bidID, bidder.accountID)
+
+    assert auction.auctionID not in crud._highest_bid_cache
+    assert crud.get_current_highest_bid(db, auction.auctionID) is None
+
+
+def test_cancel_bid_of_another_user_is_rejected(db, make_account, make_auction):
+    auction, bidder, other = make_auction(), make_account(), make_account()
+    bid = crud.create_bid(db, schemas.BidCreate(auctionID=auction.auctionID, bidPrice=1000), bidder.accountID)
+
+    assert not crud.cancel_bid(db, bid.bidID, other.accountID)
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == bid.bidID
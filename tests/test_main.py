@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+client = TestClient(app, base_url="http://localhost")
+
+
+def test_root_returns_api_overview():
+    response = client.get("/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["version"] == "2.0.0"
+    assert data["health_check"] == "/health"
+    assert data["timestamp"]
+
+
+def test_health_check():
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["services"]["database"] == "connected"
+
+
+def test_unknown_host_is_rejected():
+    response = TestClient(app, base_url="http://evil.example").get("/health")
+    assert response.status_code == 400
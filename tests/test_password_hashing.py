@@ -0,0 +1,32 @@
+import bcrypt
+
+from app import crud, models
+
+
+def _bcrypt_hash(password):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)).decode()
+
+
+def test_legacy_bcrypt_hash_is_rehashed_to_argon2_on_login(db, make_account):
+    account = make_account(password=_bcrypt_hash("Secret123!"))
+
+    assert crud.authenticate_account(db, account.username, "Secret123!") is not None
+
+    stored = db.get(models.Account, account.accountID, populate_existing=True).password
+    assert stored.startswith("$argon2id$")
+    # The upgraded hash still verifies the same password
+    assert crud.authenticate_account(db, account.username, "Secret123!") is not None
+
+
+def test_wrong_password_on_legacy_hash_is_rejected_and_not_rehashed(db, make_account):
+    legacy_hash = _bcrypt_hash("Secret123!")
+    account = make_account(password=legacy_hash)
+
+    assert crud.authenticate_account(db, account.username, "wrong-password") is None
+
+    stored = db.get(models.Account, account.accountID, populate_existing=True).password
+    assert stored == legacy_hash
+
+
+def test_unknown_username_is_rejected(db):
+    assert crud.authenticate_account(db, "no-such-user", "Secret123!") is None
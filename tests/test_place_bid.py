@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from app import crud, schemas
+
+
+def _bid(db, auction_id, bidder, price):
+    return crud.place_bid(db, schemas.BidCreate(auctionID=auction_id, bidPrice=price), bidder.accountID)
+
+
+def test_valid_bid_becomes_highest(db, make_account, make_auction):
+    auction, bidder = make_auction(), make_account()
+
+    first = _bid(db, auction.auctionID, bidder, 1000)
+    assert first.bid is not None and first.previous_highest is None
+    second = _bid(db, auction.auctionID, bidder, 5000)
+    assert second.bid is not None
+    assert second.previous_highest.bidID == first.bid.bidID
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == second.bid.bidID
+
+
+def test_too_low_and_equal_bids_are_rejected(db, make_account, make_auction):
+    auction, bidder = make_auction(price_step=1000), make_account()
+    highest = _bid(db, auction.auctionID, bidder, 5000).bid
+
+    too_low = _bid(db, auction.auctionID, bidder, 5500)
+    assert too_low.bid is None
+    assert too_low.min_price == 6000
+    equal = _bid(db, auction.auctionID, bidder, 5000)
+    assert equal.bid is None
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == highest.bidID
+    assert crud.count_bids_by_auction(db, auction.auctionID) == 1
+
+
+def test_bid_on_ended_or_missing_auction_fails(db, make_account, make_auction):
+    auction = make_auction(end_date=datetime.utcnow() - timedelta(minutes=1))
+    bidder = make_account()
+
+    assert _bid(db, auction.auctionID, bidder, 5000) is None
+    assert _bid(db, auction.auctionID + 1000, bidder, 5000) is None
+    assert crud.count_bids_by_auction(db, auction.auctionID) == 0
+
+
+def test_bid_bumps_highest_bid_cache_generation(db, make_account, make_auction):
+    auction, bidder = make_auction(), make_account()
+    first = _bid(db, auction.auctionID, bidder, 1000).bid
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == first.bidID
+    generation = crud._highest_bid_generation
+
+    second = _bid(db, auction.auctionID, bidder, 2000).bid
+    assert crud._highest_bid_generation > generation
+    assert auction.auctionID not in crud._highest_bid_cache
+    assert crud.get_current_highest_bid(db, auction.auctionID).bidID == second.bidID